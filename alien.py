@@ -1,19 +1,20 @@
-import pygame
 from pygame.sprite import Sprite
 
 class Alien(Sprite):
-    """A class to represent a single alien in the fleet."""
+    """
+    A single alien as a sprite.
+
+    The game keeps its aliens in the Fleet's arrays; Fleet.sprites() builds
+    these when something wants the aliens as separate objects, e.g. for
+    debugging, and memory_report.py compares the two.
+    """
 
     def __init__(self, ai_game):
         """Initialise the alien and set its starting position."""
         super().__init__()
-        self.screen = ai_game.screen
-
-        # Initialise settings to access alien speed
-        self.settings = ai_game.settings
 
-        # Load the alien image and set its rect attribute
-        self.image = pygame.image.load('images/alien.bmp')
+        # Use the shared alien image from the atlas and set its rect attribute
+        self.image = ai_game.assets.get_sprite('alien')
         self.rect = self.image.get_rect()
 
         # Start each new alien near the top left of the screen
@@ -22,14 +23,3 @@ class Alien(Sprite):
 
         # Store the alien's exact horizontal position
         self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect()
-
-        return (self.rect.right >= screen_rect.right) or (self.rect.left <= 0)
-    
-    def update(self):
-        """Move the alien to the right or left."""
-        self.x += self.settings.alien_speed * self.settings.fleet_direction
-        self.rect.x = self.x
\ No newline at end of file
@@ -1,25 +1,66 @@
 
+import argparse
+import os
 import sys  # Use tools in sys to exit the game when the player quits
-from time import sleep
+from time import perf_counter
 
 import pygame  # Contains functionality to make a game
 
 from settings import Settings
+from asset_manager import AssetManager
 from game_stats import GameStats
+from high_scores import HighScoreStore
 from scoreboard import Scoreboard
 from button import Button
 from ship import Ship
-from bullet import Bullet
-from alien import Alien
+from bullet_pool import BulletPool
+from fleet import Fleet
+from collision import create_collider
+from renderer import create_renderer
+from replay import InputRecorder
+from draw_lists import SimulationProcess
+from snapshot import take_snapshot, restore_snapshot, save_snapshot, load_snapshot
+from profiler import create_profiler
+from scaling import ScaledScreen
+
+# The only events the game responds to; everything else (mouse motion, text
+# input, most window events) is dropped by SDL before it reaches the queue
+HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+                  pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED,
+                  pygame.WINDOWSIZECHANGED]
+
+# Window events after which the whole screen has to be drawn again
+WINDOW_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED)
+
+# Keys whose held state moves the ship
+MOVEMENT_KEYS = (pygame.K_LEFT, pygame.K_RIGHT)
 
 class AlienInvasion:
     """Overall class to manage game assets and behaviour."""
     
-    def __init__(self):
-        """Initialise the game, and create game resources."""
-
-        # Initialise the imported pygame modules
-        pygame.init()
+    def __init__(self, headless=False, profile=False, profile_trace=None, settings=None):
+        """Initialise the game, and create game resources.
+
+        With headless=True the game uses SDL's dummy video driver, so no window
+        is opened and the logic can be stepped as fast as the CPU allows.
+        With profile=True every frame is timed and an overlay shows the
+        results; profile_trace names a file to save the timings to on exit.
+        settings can be a customised Settings instance, e.g. for benchmarks.
+        """
+        # When start-up began, to measure the time to the first frame
+        self.launch_time = perf_counter()
+        self.first_frame_time = None
+
+        self.headless = headless
+        if self.headless:
+            # Must be set before the display is initialised to take effect
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+        # Initialise only the pygame modules the game uses: the display (which
+        # brings events and the mouse with it) and fonts. pygame.init() would
+        # also start audio and joysticks, which are slow to open and unused.
+        pygame.display.init()
+        pygame.font.init()
 
         # Set the title of the game window
         pygame.display.set_caption("Alien Invasion")
@@ -27,11 +68,34 @@ class AlienInvasion:
         # Create a Clock object to manage how fast the screen updates (frame rate)
         self.clock = pygame.time.Clock()
 
-        self.settings = Settings()
+        self.settings = settings or Settings()
+        if self.headless:
+            # Nobody is watching, so don't hold the game still after a hit
+            self.settings.skip_pauses = True
+        self.settings.profile = profile
+        self.settings.profile_trace = profile_trace
 
         # Set the dimensions of the game window and create the display surface
         # Surface: part of the screen where a game element can be displayed
-        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
+        self.screen = self._create_screen()
+
+        # Only queue the events the game handles, so each frame's event loop
+        # doesn't wade through mouse motion it would ignore
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
+
+        # The movement keys' state when the keyboard was last sampled
+        self.keys_held = dict.fromkeys(MOVEMENT_KEYS, False)
+
+        # Load the sprite atlas once now that the display exists, so sprites
+        # share converted surfaces instead of reading files as they're created
+        self.assets = AssetManager()
+        self.assets.load_atlas(self.settings.atlas_manifest)
+
+        # The best scores from earlier sessions; simulations keep theirs to
+        # themselves so they never overwrite the player's
+        high_score_file = None if self.headless else self.settings.high_score_file
+        self.high_scores = HighScoreStore(high_score_file, self.settings.high_score_entries)
 
         # Create an instance to store game statistics,
         # and create a scoreboard
@@ -43,11 +107,14 @@ class AlienInvasion:
         # self argument refers to current instance of AlienInvasion
         self.ship = Ship(self)
 
-        # Create the group that holds the bullets
-        self.bullets = pygame.sprite.Group()
+        # Create the pool that holds the bullets
+        self.bullets = BulletPool(self)
+
+        # Create the fleet that holds the aliens' positions
+        self.aliens = Fleet(self)
 
-        # Create the group that holds the aliens
-        self.aliens = pygame.sprite.Group()
+        # Choose how bullets are tested against the fleet
+        self.collider = create_collider(self)
 
         # Create the initial fleet of aliens
         self._create_fleet()
@@ -55,112 +122,354 @@ class AlienInvasion:
         # Start Alien Invasion in an inactive state
         self.game_active = False
 
+        # Count logic steps and the simulated time they represent
+        self.frame_count = 0
+        self.sim_time = 0.0
+
+        # Logic steps left to hold the game still, e.g. after the ship is hit
+        self.pause_steps = 0
+
+        # Records the input of each frame when a session is being recorded;
+        # with split_process the logic's process records to record_path instead
+        self.recorder = None
+        self.record_path = None
+
         # Make the Play button.
         self.play_button = Button(self, "Play")
 
+        # Time each phase of the loop if profiling is switched on
+        self.profiler = create_profiler(self)
+
+        # Choose how the screen is redrawn each frame
+        self.renderer = create_renderer(self)
+
+    def _create_screen(self):
+        """
+        Open the window and return the surface the game draws on.
+
+        The game is always laid out at screen_width by screen_height. In a
+        window of another size, or full screen, it draws on a ScaledScreen
+        that scales it to fit instead of on the window itself.
+        """
+        settings = self.settings
+        size = (settings.screen_width, settings.screen_height)
+        if settings.fullscreen:
+            window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        elif settings.window_size and tuple(settings.window_size) != size:
+            window = pygame.display.set_mode(settings.window_size, pygame.RESIZABLE)
+        else:
+            return pygame.display.set_mode(size)
+        return ScaledScreen(window, size)
 
     def run_game(self):
         """Start the main loop for the game."""
         
         # Event: action that the user performs while playing the game, key, mouse press
 
+        try:
+            if self.settings.split_process:
+                self._run_split_process()
+            elif self.settings.fixed_timestep:
+                self._run_fixed_timestep()
+            else:
+                self._run_frame_locked()
+        finally:
+            self.shut_down()
+
+    def shut_down(self):
+        """Finish the recording, save the scores and write the profile, if any."""
+        # Make sure a recording is complete even when the player quits
+        if self.recorder:
+            self.recorder.close()
+
+        # Keep the score of a game that was still going, and save the
+        # leaderboard
+        if self.game_active:
+            self.high_scores.submit(self.stats.score, self.stats.level)
+        self.high_scores.flush()
+
+        # Save the profile, if one was asked for
+        if self.settings.profile and self.settings.profile_trace:
+            self.profiler.dump(self.settings.profile_trace)
+
+    def _run_frame_locked(self):
+        """Run one logic step and draw one frame per pass, at the frame rate."""
+        profiler = self.profiler
+
         while True:
+            profiler.begin_frame()
+
             # Call methods game
-            self._check_events()
+            with profiler.section('events'):
+                self._check_events()
 
             if self.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-        
-            self._update_screen()
-            # Limit the game loop to a maximum of 60 frames per second
-            self.clock.tick(60)
-
-    
-    def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Create an alien and keep adding aliens until there's no room left.
-        # Spacing between aliens is one alien width and one alien height
-
-        # Create a single alien to get its width and height (used to calculate how many fit)
-        # A rect's size is a tuple of (width, height)
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
+                self.step()
 
-        # Initial x- and y-values: one alien width in from the left and one alien height 
-        # down from the top
-        current_x, current_y = alien_width, alien_height
+            with profiler.section('screen'):
+                self._update_screen()
+            profiler.end_frame()
 
-        # Keep adding aliens while there is enough vertical space on the screen
-        while current_y < (self.settings.screen_height - 3 * alien_height):
+            # Limit the game loop to a maximum of 60 frames per second
+            self.clock.tick(self.settings.frame_rate)
 
-            # Keep adding aliens while there is enough horizontal space on the screen
-            while current_x < (self.settings.screen_width - 2 * alien_width):
-                # Call method to create alien at give x position
-                self._create_alien(current_x, current_y)
+    def _run_fixed_timestep(self):
+        """
+        Run logic at a fixed rate and draw as often as the render rate allows.
 
-                # Move to the position for the next alien, leaving a gap equal to one alien width
-                current_x += 2 * alien_width
+        Real time is added to an accumulator and spent in whole logic steps,
+        so the game runs at the same speed however fast frames are drawn.
+        Frames are drawn part of the way between the last two steps. When a
+        frame runs late, several steps are taken before the next draw, so
+        frames are dropped rather than steps, up to max_steps_per_frame.
+        """
+        profiler = self.profiler
+        timestep = self.settings.timestep
+        max_steps = self.settings.max_steps_per_frame
 
-            # Finished a row; reset x value and increment y value
-            current_x = alien_width
-            current_y += 2 * alien_height
+        accumulator = 0.0
+        previous = perf_counter()
 
+        while True:
+            profiler.begin_frame()
+
+            now = perf_counter()
+            accumulator += now - previous
+            previous = now
+
+            with profiler.section('events'):
+                self._check_events()
+
+            steps = 0
+            while accumulator >= timestep and steps < max_steps:
+                if self.game_active:
+                    self._remember_positions()
+                    self.step()
+                accumulator -= timestep
+                steps += 1
+
+            if self.recorder:
+                self.recorder.record_steps(steps)
+
+            # Too far behind to catch up; let the game slow down instead
+            if steps == max_steps:
+                accumulator = min(accumulator, timestep)
+
+            # Only interpolate while things are moving
+            alpha = accumulator / timestep if self.game_active else 1.0
+
+            with profiler.section('screen'):
+                self._update_screen(alpha)
+            profiler.end_frame()
+
+            # 0 leaves drawing uncapped
+            self.clock.tick(self.settings.render_rate)
+
+    def _run_split_process(self):
+        """
+        Run the logic in another process and draw the frames it publishes.
+
+        The logic steps at the frame rate on a core of its own, so a frame
+        that's slow to draw doesn't hold it back; this process reads input,
+        passes it on, and draws the newest draw list at the render rate.
+        When the game ends, this game is set to where the logic left off.
+        """
+        profiler = self.profiler
+
+        # The logic's process submits and saves the scores; this one only shows them
+        self.high_scores = HighScoreStore(None, self.settings.high_score_entries)
+
+        simulation = SimulationProcess(self, self.record_path)
+        try:
+            while True:
+                profiler.begin_frame()
+
+                with profiler.section('events'):
+                    self._forward_events(simulation)
+
+                # Otherwise a logic process that failed would leave the window
+                # showing its last frame; it has printed its own traceback
+                if not simulation.process.is_alive():
+                    raise RuntimeError("The game's logic process stopped unexpectedly "
+                                       f"(exit code {simulation.process.exitcode})")
+
+                simulation.ring.apply(self)
+
+                with profiler.section('screen'):
+                    self._update_screen()
+                profiler.end_frame()
+
+                # 0 leaves drawing uncapped
+                self.clock.tick(self.settings.render_rate)
+        finally:
+            state = simulation.stop()
+            if state is not None:
+                self.restore(state)
+
+    def _forward_events(self, simulation):
+        """Send this frame's input to the logic's process, and handle the window's own events."""
+        events = self._poll_input()
+        simulation.send(events)
+
+        for event in events:
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                             and event.key == pygame.K_q):
+                sys.exit()
+            elif event.type in WINDOW_EVENTS:
+                self._window_changed()
+
+    def _remember_positions(self):
+        """Store where everything is before a step, so frames can be interpolated."""
+        self.ship.remember_position()
+        self.bullets.remember_positions()
+        self.aliens.remember_positions()
+
+    def record(self, path):
+        """Record the input of every frame from now on to the file at path."""
+        if self.settings.split_process:
+            # The logic's process handles the input, so it makes the recording
+            self.record_path = path
+            return
+        self.recorder = InputRecorder(path, self.settings.frame_rate, self.snapshot())
+
+    def snapshot(self):
+        """Return the state of the simulation as bytes, e.g. to fork or checkpoint it."""
+        return take_snapshot(self)
+
+    def restore(self, data):
+        """Put the simulation back into a state returned by snapshot()."""
+        restore_snapshot(self, data)
+
+    def step(self):
+        """Advance the game logic by one fixed timestep, without drawing."""
+        if self.pause_steps:
+            # Paused: time passes, but nothing moves
+            self.pause_steps -= 1
+        else:
+            profiler = self.profiler
+            with profiler.section('ship'):
+                self.ship.update()
+            with profiler.section('bullets'):
+                self._update_bullets()
+            with profiler.section('aliens'):
+                self._update_aliens()
 
-    def _create_alien(self, x_position, y_position):
-        """Create an alien and place it in the row."""
-        # Create a new alien
-        new_alien = Alien(self)
+        self.frame_count += 1
+        self.sim_time += self.settings.timestep
 
-        # Set the alien's x position (float for precise movement later if needed)
-        new_alien.x = x_position
+    def run_simulation(self, max_frames):
+        """
+        Step the game logic as fast as possible, with no rendering or waiting.
 
-        # Update the rect x position for drawing on the screen
-        new_alien.rect.x = x_position
+        Runs until the game ends or max_frames steps have been taken, and
+        returns the number of steps that were run.
+        """
+        if not self.game_active:
+            self.start_game()
 
-        # Update the rect y position for drawing on the screen
-        new_alien.rect.y = y_position
+        frames = 0
+        while self.game_active and frames < max_frames:
+            self.step()
+            frames += 1
+        return frames
 
-        # Add the alien to the gorup
-        self.aliens.add(new_alien)
+    
+    def _create_fleet(self):
+        """Create the fleet of aliens."""
+        # The layout only depends on the screen and alien sizes, so it's worked
+        # out once and cached; a new fleet just copies it into the fleet's arrays
+        self.aliens.reset_to_layout()
 
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        # Loop through all aliens in the fleet
-        for alien in self.aliens.sprites():
-            # If any alien is at the screen edge...
-            if alien.check_edges():
-                # Change the direction of the entire fleet
-                self._change_fleet_direction()
-                # Exit the loop — only one alien needs to trigger the change
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        # Move every alien in the fleet down by a certain amount
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-
-        # Reverse the fleet's horizontal movement direction
-        # If the fleet was moving right (1), it now moves left (-1), and vice versa
-        self.settings.fleet_direction *= -1
+        # Each fleet's bounding box is checked, rather than every alien
+        at_edge = self.aliens.check_edges()
+        if at_edge.any():
+            # Change the direction of the fleets that reached an edge
+            self._change_fleet_direction(at_edge)
+
+    def _change_fleet_direction(self, fleets):
+        """Drop the fleets selected by a boolean array and change their direction."""
+        # Move every alien in those fleets down by their drop distance, and
+        # reverse their horizontal movement: right (1) becomes left (-1), and
+        # vice versa
+        self.aliens.change_direction(fleets)
     
 
     def _check_events(self):
         """Respond to keypresses and mouse event; event loop."""
-        for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    # Exit the game if the window is closed
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    self._check_keydown_events(event)
-                elif event.type == pygame.KEYUP:
-                    self._check_keyup_events(event)
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self._check_play_button(mouse_pos)
+        events = self._poll_input()
+
+        # Log this frame's input before handling it, so quitting is recorded too
+        if self.recorder:
+            self.recorder.record_frame(events)
+
+        for event in events:
+            self._handle_event(event)
+
+    def _poll_input(self):
+        """Return this frame's events, in the game's coordinates, and the sampled keys."""
+        events = pygame.event.get()
+        if isinstance(self.screen, ScaledScreen):
+            # Clicks arrive in window pixels, but the game and recordings use
+            # its own coordinates
+            events = [self.screen.logical_event(event) for event in events]
+        events += self._sample_keys(events)
+        self.profiler.input_sampled()
+        return events
+
+    def _sample_keys(self, events):
+        """
+        Return key events for movement keys whose state changed unannounced.
+
+        The keyboard is read right before the logic step, after the queue has
+        been emptied. A key that went down or up since the last sample without
+        its event having been handled (it arrived after the queue was read, or
+        was lost while the window was out of focus) gets a made-up event, so
+        the ship responds this frame and recordings still replay exactly.
+        Only changes are acted on, so events posted by other code aren't undone.
+        """
+        pressed = pygame.key.get_pressed()
+        sampled = []
+        for key, was_held in self.keys_held.items():
+            held = pressed[key]
+            if held == was_held:
+                continue
+            self.keys_held[key] = held
+
+            # Whether the ship will be moving once this frame's events are handled
+            moving = self.ship.moving_left if key == pygame.K_LEFT else self.ship.moving_right
+            for event in events:
+                if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key == key:
+                    moving = event.type == pygame.KEYDOWN
+
+            if held != moving:
+                event_type = pygame.KEYDOWN if held else pygame.KEYUP
+                sampled.append(pygame.event.Event(event_type, key=key))
+        return sampled
+
+    def _handle_event(self, event):
+        """Respond to a single keypress, mouse or window event."""
+        if event.type == pygame.QUIT:
+            # Exit the game if the window is closed
+            sys.exit()
+        elif event.type == pygame.KEYDOWN:
+            self._check_keydown_events(event)
+        elif event.type == pygame.KEYUP:
+            self._check_keyup_events(event)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Use the position stored in the event so replays click the same spot
+            self._check_play_button(event.pos)
+        elif event.type in WINDOW_EVENTS:
+            self._window_changed()
+
+    def _window_changed(self):
+        """Redraw everything after the window's contents were lost or it was resized."""
+        if isinstance(self.screen, ScaledScreen):
+            # Rescale the game to the window's new size
+            self.screen.fit(pygame.display.get_surface())
+        self.renderer.invalidate()
 
 
     def _check_play_button(self, mouse_pos):
@@ -168,59 +477,57 @@ class AlienInvasion:
         # collidepoint() returns True if the given point (x, y) lies within the button’s rect.
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         if button_clicked and not self.game_active:
+            self.start_game()
+
+    def start_game(self):
+        """Reset the settings, statistics and sprites, and start a new game."""
+        # Reset the game settings
+        self.settings.initialise_dynamic_settings()
+
+        # Reset the game statistics
+        self.stats.reset_stats()
+        self.sb.prep_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+        self.game_active = True
+        self.frame_count = 0
+        self.sim_time = 0.0
+        self.pause_steps = 0
+
+        # Get rid of any remaining bullets and aliens, and set the fleets
+        # moving the way they start every game
+        self.bullets.empty()
+        self.aliens.empty()
+        self.aliens.reset_movement()
+
+        # Create a new fleet and centre the ship
+        self._create_fleet()
+        self.ship.center_ship()
 
-            # Reset the game settings
-            self.settings.initialise_dynamic_settings()
-
-            # Reset the game statistics
-            self.stats.reset_stats()
-            self.sb.prep_score()
-            self.sb.prep_level()
-            self.sb.prep_ships()
-            self.game_active = True
-
-            # Get rid of any remaining bullets and aliens
-            self.bullets.empty()
-            self.aliens.empty()
-
-            # Create a new fleet and centre the ship
-            self._create_fleet()
-            self.ship.center_ship()
-
-            # Hide the mouse cursor
-            pygame.mouse.set_visible(False)
+        # Hide the mouse cursor
+        pygame.mouse.set_visible(False)
 
 
     def _update_bullets(self):
         """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions
+        # Update bullet positions and get rid of bullets that have disappeared,
+        # all in one pass over the pool
         self.bullets.update()
 
-        # Get rid of bullets that have disappeared
-        # Loop through copy as Python expects list will stay the same length as long
-        # as the loop is running
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
+        with self.profiler.section('collisions'):
+            self._check_bullet_alien_collisions()
 
 
     def _check_bullet_alien_collisions(self):
         """Respond to bullet-alien collisions."""
         # Check for any bullets that have hit aliens
         # If so, get rid of the bullet and the alien
-        collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, False, True
-        )
+        aliens_hit = self.collider.collide_bullets(self.bullets)
 
         # Check whether there has been a collision
-        # collisions is a dictionary returned by pygame.sprite.groupcollide
-        # Key   → a bullet object
-        # Value → a list of alien objects hit by that bullet
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
+        # aliens_hit is the number of aliens destroyed this frame
+        if aliens_hit:
+            self.stats.score += self.settings.alien_points * aliens_hit
             self.sb.prep_score()
             self.sb.check_high_score()
 
@@ -235,6 +542,19 @@ class AlienInvasion:
             self.stats.level += 1
             self.sb.prep_level()
 
+            # Give the player a moment before the new fleet moves
+            self._pause(self.settings.level_pause)
+
+    def _pause(self, seconds):
+        """
+        Hold the game still for a number of seconds.
+
+        The pause is counted in logic steps, so the loop keeps handling
+        events and drawing frames while it lasts.
+        """
+        if not self.settings.skip_pauses:
+            self.pause_steps = round(seconds / self.settings.timestep)
+
 
     def _update_aliens(self):
         """Check if the fleet is at an edge, then update positions."""
@@ -242,7 +562,7 @@ class AlienInvasion:
         self.aliens.update()
 
         # Check if the ship has collided with any alien in the group
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.aliens.collide_rect(self.ship.rect):
             # If a collision is detected, print a message to the console
             self._ship_hit()
 
@@ -264,44 +584,44 @@ class AlienInvasion:
             self._create_fleet()
             self.ship.center_ship()
 
-            # Pause.
-            sleep(0.5)
+            # Pause so the player can see what happened
+            self._pause(self.settings.respawn_pause)
         else:
             self.game_active = False
             pygame.mouse.set_visible(True)
+
+            # Save the finished game's score now that play has stopped
+            self.high_scores.submit(self.stats.score, self.stats.level)
+            self.high_scores.flush()
         
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got hit
-                self._ship_hit()
-                break
-
-    def _update_screen(self):
-        """Updates images on the screen, and flip to the new screen."""
-        # Updates the background colour
-        self.screen.fill(self.settings.bg_colour)
-
-        # Draw bullets on the screen
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        
-        # Draw the ship on the screen
-        self.ship.blitme()
+        if self.aliens.check_bottom():
+            # Treat this the same as if the ship got hit
+            self._ship_hit()
 
-        # Draw the aliens
-        self.aliens.draw(self.screen)
+    def _update_screen(self, alpha=1.0):
+        """Draw the game elements and update the display, interpolated by alpha."""
+        self.renderer.render(alpha)
 
-        # Draw the score information
-        self.sb.show_score()
+        if self.first_frame_time is None:
+            self._finish_startup()
 
-        # Draw the play button if the is inactive
-        if not self.game_active:
-            self.play_button.draw_button()
+    def _finish_startup(self):
+        """
+        Do the set-up the first frame didn't need, once it's on the screen.
+
+        The saved high score is read from disk and the digits the scoreboard
+        will need are rendered now, so neither delays the window appearing.
+        """
+        self.first_frame_time = perf_counter() - self.launch_time
+        if self.settings.report_startup:
+            print(f"Time to first frame: {self.first_frame_time * 1000:.1f} ms")
 
-        # Update the screen with the latest drawings and changes
-        pygame.display.flip()
+        if self.high_scores.best() > self.stats.high_score:
+            self.stats.high_score = self.high_scores.best()
+            self.sb.prep_high_score()
+        self.sb.text_cache.preload_glyphs()
 
 
     def _check_keydown_events(self, event):
@@ -327,14 +647,74 @@ class AlienInvasion:
             self.ship.moving_left = False
 
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
+        """Fire a new bullet from the top of the ship, reusing a pool slot."""
+        if self.pause_steps:
+            # Nothing can be fired while the game is held still
+            return
         if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
+            self.bullets.fire(self.ship.rect.midtop)
+
+
+def window_size(text):
+    """Parse a WIDTHxHEIGHT window size for argparse, e.g. 1920x1080."""
+    width, _, height = text.lower().partition('x')
+    try:
+        size = (int(width), int(height))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected WIDTHxHEIGHT, e.g. 1280x720, not {text!r}") from None
+    if min(size) <= 0:
+        raise argparse.ArgumentTypeError(f"window size must be positive, not {text!r}")
+    return size
 
 
 # Only run the game if this file is executed directly (not imported)
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record the session's input to PATH for replay.py")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each frame and show a profiling overlay")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="with --profile, save frame timings to PATH (.csv or .json) on exit")
+    parser.add_argument('--fixed-timestep', action='store_true',
+                        help="run the logic at a fixed rate and interpolate drawing")
+    parser.add_argument('--render-rate', type=int, metavar='FPS',
+                        help="with --fixed-timestep or --split-process, frames drawn per second "
+                             "(0 for uncapped)")
+    parser.add_argument('--window', metavar='WIDTHxHEIGHT', type=window_size,
+                        help="open a resizable window of this size and scale the game to fit")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="play full screen, scaling the game to fit")
+    parser.add_argument('--split-process', action='store_true',
+                        help="run the logic in a separate process from the drawing")
+    parser.add_argument('--load', metavar='PATH',
+                        help="start from a snapshot saved with snapshot.py or --save")
+    parser.add_argument('--save', metavar='PATH',
+                        help="save a snapshot of the game to PATH on exit")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print how long the game took to draw its first frame")
+    args = parser.parse_args()
+
+    # The window has to be chosen before the game opens it
+    settings = Settings()
+    if args.window:
+        settings.window_size = args.window
+    settings.fullscreen = args.fullscreen
+
     # Create an instance of the game and start the main loop
-    ai =  AlienInvasion()
-    ai.run_game()
\ No newline at end of file
+    ai =  AlienInvasion(profile=args.profile, profile_trace=args.trace, settings=settings)
+    ai.settings.fixed_timestep = args.fixed_timestep
+    ai.settings.report_startup = args.startup_time
+    if args.render_rate is not None:
+        ai.settings.render_rate = args.render_rate
+    ai.settings.split_process = args.split_process
+    if args.load:
+        load_snapshot(ai, args.load)
+    if args.record:
+        ai.record(args.record)
+    try:
+        ai.run_game()
+    finally:
+        if args.save:
+            save_snapshot(ai, args.save)
\ No newline at end of file
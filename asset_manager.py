@@ -0,0 +1,96 @@
+import json
+import os
+
+import pygame
+
+class AssetManager:
+    """A class to load game art once and share it between sprites."""
+
+    def __init__(self):
+        """Initialise the asset cache."""
+        # Maps an image path to the surface loaded from it.
+        # Every sprite that asks for the same path gets the same surface,
+        # so building a fleet never has to touch the disk.
+        self.images = {}
+
+        # Maps a sprite name to its frames, each a subsurface of an atlas
+        self.sprites = {}
+
+        # Maps a font size to the font, shared by the HUD, buttons and overlay
+        self.fonts = {}
+
+    def preload(self, paths):
+        """Load a list of images up front, e.g. while the game starts."""
+        for path in paths:
+            self.get_image(path)
+
+    def get_image(self, path):
+        """Return the shared surface for the image at path, loading it if needed."""
+        image = self.images.get(path)
+        if image is None:
+            image = self._load_image(path)
+            self.images[path] = image
+        return image
+
+    def _load_image(self, path):
+        """Load an image from disk and convert it to the display's pixel format."""
+        image = pygame.image.load(path)
+
+        # convert() needs a display mode to exist; without one keep the raw
+        # surface so assets can still be loaded before the window is created
+        if pygame.display.get_surface() is None:
+            return image
+
+        # Images with per-pixel alpha keep it; everything else is converted to
+        # the display format so every blit is a straight copy
+        if image.get_alpha() is not None and image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def load_atlas(self, manifest_path):
+        """
+        Load an atlas made by build_atlas.py and register its sprites.
+
+        The atlas image is loaded and converted once; each frame is a
+        subsurface of it, so frames share its pixels instead of copying them.
+        A missing manifest is ignored, and sprites fall back to their own files.
+        """
+        try:
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return
+
+        directory = os.path.dirname(manifest_path)
+        atlas = self.get_image(os.path.join(directory, manifest['image']))
+        for name, rects in manifest['sprites'].items():
+            self.sprites[name] = [atlas.subsurface(rect) for rect in rects]
+
+    def get_frames(self, name):
+        """Return every frame of the named sprite."""
+        frames = self.sprites.get(name)
+        if frames is None:
+            # Not in an atlas, so use the sprite's own image
+            frames = [self.get_image(f'images/{name}.bmp')]
+            self.sprites[name] = frames
+        return frames
+
+    def get_sprite(self, name, frame=0):
+        """Return one frame of the named sprite, shared by everything that uses it."""
+        return self.get_frames(name)[frame]
+
+    def get_font(self, size):
+        """Return the shared default font at size, loading it the first time."""
+        font = self.fonts.get(size)
+        if font is None:
+            # The bundled default font; SysFont(None, ...) ends up with the same
+            # font, but only after scanning every font installed on the system
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def clear(self):
+        """Forget every cached surface and font."""
+        self.images.clear()
+        self.sprites.clear()
+        self.fonts.clear()
@@ -0,0 +1,155 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from settings import Settings, setting_override
+from policies import POLICIES, apply_action
+
+# Each worker process keeps one headless game and reuses it for every game
+# it plays, so pygame and the display are only set up once per process
+_worker_game = None
+
+
+def _init_worker(overrides):
+    """Create the worker process's headless game."""
+    global _worker_game
+
+    # SDL normally turns SIGTERM into a quit event, which would stop the pool
+    # from shutting its workers down
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+    # Imported here so the parent process never initialises pygame
+    from alien_invasion import AlienInvasion
+
+    settings = Settings()
+    settings.override(**overrides)
+    _worker_game = AlienInvasion(headless=True, settings=settings)
+
+
+def play_game(task):
+    """Play one seeded game to the end (or max_frames) and return its statistics."""
+    game_number, seed_sequence, policy_name, max_frames = task
+    ai_game = _worker_game
+    policy = POLICIES[policy_name](np.random.default_rng(seed_sequence))
+
+    ai_game.start_game()
+    while ai_game.game_active and ai_game.frame_count < max_frames:
+        apply_action(ai_game, policy.act(ai_game))
+        ai_game.step()
+
+    stats = ai_game.stats
+    ships_lost = ai_game.settings.ship_limit - stats.ship_left
+    if not ai_game.game_active:
+        # The last ship was lost too, which ended the game
+        ships_lost += 1
+
+    return {
+        'game': game_number,
+        'score': stats.score,
+        'level': stats.level,
+        'ships_lost': ships_lost,
+        'frames': ai_game.frame_count,
+        'game_over': not ai_game.game_active,
+    }
+
+
+def summarise(results):
+    """Return the mean, spread and range of each statistic over all the games."""
+    summary = {'games': len(results)}
+    for name in ('score', 'level', 'ships_lost', 'frames'):
+        values = np.array([result[name] for result in results], dtype=np.float64)
+        summary[name] = {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': float(values.min()),
+            'p50': float(np.percentile(values, 50)),
+            'p90': float(np.percentile(values, 90)),
+            'max': float(values.max()),
+        }
+    return summary
+
+
+def _available_cpus():
+    """Return the number of CPUs this process may run on."""
+    # cpu_count() reports every CPU in the machine, even in a container
+    # limited to a few of them
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return multiprocessing.cpu_count()
+
+
+def run_batch(games, policy_name, seed=0, max_frames=36000, workers=None,
+              overrides=None):
+    """
+    Play a number of headless games across a pool of worker processes.
+
+    Every game gets its own random stream spawned from seed, so results
+    don't depend on how games are shared out between workers. Returns the
+    per-game results, in game order.
+    """
+    if policy_name not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy_name!r}")
+
+    seeds = np.random.SeedSequence(seed).spawn(games)
+    tasks = [(number, seeds[number], policy_name, max_frames) for number in range(games)]
+
+    workers = workers or _available_cpus()
+    chunksize = max(1, games // (workers * 4))
+    with multiprocessing.Pool(workers, _init_worker, (overrides or {},)) as pool:
+        results = list(pool.imap_unordered(play_game, tasks, chunksize))
+
+    return sorted(results, key=lambda result: result['game'])
+
+
+def main():
+    """Run a batch of simulated games and print the aggregated statistics."""
+    parser = argparse.ArgumentParser(description="Play many headless games in parallel.")
+    parser.add_argument('--games', type=int, default=100, help="games to play (default: 100)")
+    parser.add_argument('--policy', choices=list(POLICIES), default='tracking',
+                        help="how the ship is controlled (default: tracking)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the whole batch")
+    parser.add_argument('--max-frames', type=int, default=36000,
+                        help="stop a game after this many frames (default: 36000)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        type=setting_override,
+                        help="override a setting, e.g. --set speedup_scale=1.2")
+    parser.add_argument('--output', metavar='PATH',
+                        help="save every game's results and the summary as JSON")
+    args = parser.parse_args()
+
+    overrides = dict(args.set)
+    try:
+        Settings().override(**overrides)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    results = run_batch(args.games, args.policy, args.seed, args.max_frames,
+                        args.workers, overrides)
+    elapsed = time.perf_counter() - start
+
+    summary = summarise(results)
+    total_frames = sum(result['frames'] for result in results)
+    print(f"{args.games} games, {total_frames:,} frames in {elapsed:.2f}s "
+          f"({total_frames / elapsed:,.0f} frames per second)")
+    for name in ('score', 'level', 'ships_lost', 'frames'):
+        values = summary[name]
+        print(f"{name:>10}: mean {values['mean']:,.1f}  std {values['std']:,.1f}  "
+              f"min {values['min']:,.0f}  p50 {values['p50']:,.0f}  "
+              f"p90 {values['p90']:,.0f}  max {values['max']:,.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'settings': overrides, 'policy': args.policy, 'seed': args.seed,
+                       'summary': summary, 'games': results}, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
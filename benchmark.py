@@ -0,0 +1,200 @@
+import argparse
+import gc
+import json
+import sys
+import time
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+# The operations that are timed, each reported in calls per second
+OPERATIONS = ('create_fleet', 'update_aliens', 'collisions', 'update_screen')
+
+# Each scenario is a name and the settings it changes
+SCENARIOS = {
+    'default': {},
+    'rapid_fire': {'bullets_allowed': 200},
+    'dense_fleet': {'fleet_spacing': 1.25},
+    'full_hd': {'screen_width': 1920, 'screen_height': 1080},
+    'full_hd_rapid_dense': {'screen_width': 1920, 'screen_height': 1080,
+                            'bullets_allowed': 200, 'fleet_spacing': 1.25},
+    '4k_dense': {'screen_width': 3840, 'screen_height': 2160, 'fleet_spacing': 1.25},
+    'multi_fleet': {'screen_width': 1920, 'screen_height': 1080, 'fleet_spacing': 1.25,
+                    'fleet_count': 6, 'fleet_speed_step': 0.2, 'bullets_allowed': 50},
+    # Thousands of aliens in a dozen fleets, to check a big formation holds 60 FPS
+    'stress': {'screen_width': 3840, 'screen_height': 2160, 'fleet_spacing': 1.05,
+               'fleet_count': 12, 'fleet_speed_step': 0.1, 'bullets_allowed': 200},
+}
+
+
+def time_calls(function, min_time, rounds):
+    """
+    Return the calls per second of function, the best of rounds timings.
+
+    Each round calls function in a batch, doubling its size until the batch
+    takes at least min_time, so even very quick calls are timed over a
+    stretch long enough that clock resolution and noise don't matter.
+    """
+    best = 0.0
+    number = 1
+    for _ in range(rounds):
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            number *= 2
+        best = max(best, number / elapsed)
+    return best
+
+
+def play_frames(ai_game, frames):
+    """
+    Play frames of a scripted game and return each operation's time in each frame.
+
+    The ship sweeps back and forth firing as fast as it's allowed to, and a
+    new game is started whenever the last one ends. Only the timed calls are
+    counted; everything else in the frame is left out.
+    """
+    elapsed = {'update_aliens': [], 'collisions': [], 'update_screen': []}
+
+    ai_game.start_game()
+    for frame in range(frames):
+        # Scripted input: change direction every two seconds and keep firing
+        moving_right = (frame // 120) % 2 == 0
+        ai_game.ship.moving_right = moving_right
+        ai_game.ship.moving_left = not moving_right
+        ai_game._fire_bullet()
+
+        ai_game.ship.update()
+        ai_game.bullets.update()
+
+        start = time.perf_counter()
+        ai_game._check_bullet_alien_collisions()
+        after_collisions = time.perf_counter()
+        ai_game._update_aliens()
+        after_aliens = time.perf_counter()
+        ai_game._update_screen()
+        after_screen = time.perf_counter()
+
+        elapsed['collisions'].append(after_collisions - start)
+        elapsed['update_aliens'].append(after_aliens - after_collisions)
+        elapsed['update_screen'].append(after_screen - after_aliens)
+
+        if not ai_game.game_active:
+            ai_game.start_game()
+    return elapsed
+
+
+def run_scenario(overrides, frames, rounds=3, min_time=0.2):
+    """
+    Play a scripted game headlessly and time each operation separately.
+
+    Building the fleet is timed on its own for at least min_time a round,
+    keeping the fastest round. The other operations are timed over frames
+    of play, and as every round plays the same game, each frame keeps its
+    fastest time over the rounds, so a stall in one frame doesn't count
+    against it.
+    """
+    settings = Settings()
+    settings.override(**overrides)
+    ai_game = AlienInvasion(headless=True, settings=settings)
+    ai_game.start_game()
+    fleet_size = len(ai_game.aliens)
+
+    # Collections would land in whichever call happened to trigger them, so
+    # they're put off while timing, as timeit does
+    gc.collect()
+    gc.disable()
+    try:
+        # Building the fleet happens on level changes, respawns and Play clicks
+        rates = {'create_fleet': time_calls(ai_game._create_fleet, min_time, rounds)}
+
+        # Each round plays the same scripted game from the start
+        fastest = {}
+        for _ in range(rounds):
+            for name, times in play_frames(ai_game, frames).items():
+                fastest[name] = list(map(min, fastest.get(name, times), times))
+    finally:
+        gc.enable()
+
+    for name, times in fastest.items():
+        elapsed = sum(times)
+        rates[name] = frames / elapsed if elapsed else float('inf')
+
+    rates = {name: rates[name] for name in OPERATIONS}
+    return {'fleet_size': fleet_size, 'rates': rates}
+
+
+def compare(results, baseline, tolerance):
+    """Print how results compare with a baseline and return the regressions found."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            print(f"{name}: no baseline")
+            continue
+
+        for operation in OPERATIONS:
+            new_rate = result['rates'][operation]
+            old_rate = old['rates'].get(operation)
+            if not old_rate:
+                continue
+            ratio = new_rate / old_rate
+            marker = ''
+            if ratio < 1 - tolerance:
+                marker = '  REGRESSION'
+                regressions.append((name, operation, ratio))
+            print(f"{name:>22} {operation:>14}: {ratio:6.2f}x baseline{marker}")
+    return regressions
+
+
+def main():
+    """Run the benchmarks, print a table, and save or compare baselines."""
+    parser = argparse.ArgumentParser(description="Benchmark Alien Invasion's game loop.")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run, from: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--frames', type=int, default=1200,
+                        help="frames to play in each scenario (default: 1200)")
+    parser.add_argument('--rounds', type=int, default=3,
+                        help="times to time each operation, keeping the fastest (default: 3)")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="seconds to keep building the fleet for in each round "
+                             "(default: 0.2)")
+    parser.add_argument('--save', metavar='PATH', help="save the results as a baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="slowdown allowed before a result counts as a regression "
+                             "(default: 0.1)")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    results = {}
+
+    print(f"{'scenario':>22} {'aliens':>7}" + ''.join(f"{name:>15}" for name in OPERATIONS))
+    for name in names:
+        result = run_scenario(SCENARIOS[name], args.frames, args.rounds, args.min_time)
+        results[name] = result
+        print(f"{name:>22} {result['fleet_size']:>7}"
+              + ''.join(f"{result['rates'][op]:>15,.0f}" for op in OPERATIONS))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'frames': args.frames, 'scenarios': results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print()
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
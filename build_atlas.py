@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import sys
+
+import pygame
+
+# The art packed into the game's atlas: each sprite name and the image files
+# for its frames, in order
+SPRITES = {
+    'alien': ['images/alien.bmp'],
+    'ship': ['images/ship.bmp'],
+}
+
+# Empty pixels left around every frame, so a frame that's scaled or filtered
+# later never picks up its neighbour's edge
+PADDING = 1
+
+
+def pack(sizes, max_width):
+    """
+    Place rectangles of the given sizes in rows no wider than max_width.
+
+    Returns each rectangle's (x, y) in the order given, and the size of the
+    sheet that holds them all. Tall rectangles go first so rows waste little
+    space.
+    """
+    order = sorted(range(len(sizes)), key=lambda index: sizes[index][1], reverse=True)
+    positions = [None] * len(sizes)
+    x = y = row_height = sheet_width = 0
+    for index in order:
+        width, height = sizes[index]
+        if x and x + width + 2 * PADDING > max_width:
+            # Start a new row under the tallest rectangle in this one
+            y += row_height
+            x = row_height = 0
+        positions[index] = (x + PADDING, y + PADDING)
+        x += width + PADDING
+        row_height = max(row_height, height + PADDING)
+        sheet_width = max(sheet_width, x + PADDING)
+    return positions, (sheet_width, y + row_height + PADDING)
+
+
+def build_atlas(sprites, output, max_width=1024):
+    """
+    Pack every frame of sprites into one image and write it with a manifest.
+
+    output is the path without an extension; output.bmp holds the art and
+    output.json maps each sprite name to the rect of each of its frames.
+    """
+    names, images = [], []
+    for name, paths in sprites.items():
+        for path in paths:
+            names.append(name)
+            images.append(pygame.image.load(path))
+
+    positions, sheet_size = pack([image.get_size() for image in images], max_width)
+    sheet = pygame.Surface(sheet_size)
+    frames = {name: [] for name in sprites}
+    for name, image, (x, y) in zip(names, images, positions):
+        sheet.blit(image, (x, y))
+        frames[name].append([x, y, image.get_width(), image.get_height()])
+
+    image_path = output + '.bmp'
+    pygame.image.save(sheet, image_path)
+
+    manifest = {'image': os.path.basename(image_path), 'sprites': frames}
+    with open(output + '.json', 'w') as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def main():
+    """Build the atlas from the game's art, or from sprites given on the command line."""
+    parser = argparse.ArgumentParser(description="Pack Alien Invasion's art into an atlas.")
+    parser.add_argument('sprites', nargs='*', metavar='NAME=PATH',
+                        help="a sprite frame to pack; repeat a name for more frames "
+                             "(default: the game's own art)")
+    parser.add_argument('--output', default='images/atlas',
+                        help="atlas path without an extension (default: images/atlas)")
+    parser.add_argument('--max-width', type=int, default=1024,
+                        help="widest the atlas image may be (default: 1024)")
+    args = parser.parse_args()
+
+    sprites = {}
+    for item in args.sprites:
+        name, _, path = item.partition('=')
+        if not path:
+            parser.error(f"expected NAME=PATH, not {item!r}")
+        sprites.setdefault(name, []).append(path)
+
+    manifest = build_atlas(sprites or SPRITES, args.output, args.max_width)
+    frame_total = sum(len(frames) for frames in manifest['sprites'].values())
+    print(f"Packed {frame_total} frames of {len(manifest['sprites'])} sprites "
+          f"into {args.output}.bmp")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,31 +3,24 @@ import pygame
 from pygame.sprite import Sprite
 
 class Bullet(Sprite):
-    """A class to manage bullets fired from the ship."""
+    """
+    A single bullet as a sprite.
+
+    The game keeps its bullets in the BulletPool's arrays; BulletPool.sprites()
+    builds these when something wants the bullets as separate objects, e.g.
+    for debugging, and memory_report.py compares the two.
+    """
 
     def __init__(self, ai_game):
         """Create a bullet object at the ship's current position."""
         super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        self.colour = self.settings.bullet_colour
+        settings = ai_game.settings
 
         # Create a bullet rect at (0, 0) and then set correct position
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
+        self.rect = pygame.Rect(0, 0, settings.bullet_width, settings.bullet_height)
         self.rect.midtop = ai_game.ship.rect.midtop
 
         # Store the bullet's position as a float
         # Important because pygame.Rect stores coordinates as integers, but smooth movement 
         # (like moving 0.5 pixels at a time) requires float precision.
         self.y = float(self.rect.y)
-
-    def update(self):
-        """Move the bullet up the screen."""
-        # Update the exact position of the bullet
-        self.y -= self.settings.bullet_speed
-
-        # Update the rect position
-        self.rect.y = self.y
-
-    def draw_bullet(self):
-        pygame.draw.rect(self.screen, self.colour, self.rect)
@@ -0,0 +1,155 @@
+import numpy as np
+
+from bullet import Bullet
+from fleet import to_pixels
+
+class BulletPool:
+    """
+    A class to manage the ship's bullets as a pool of preallocated arrays.
+
+    Live bullets are packed at the front of the arrays. Firing fills the next
+    free slot, moving every bullet is one array operation, and bullets that
+    leave the screen are culled by compacting the arrays in place, so no
+    objects are created or thrown away however fast the ship fires.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise an empty pool sized for the allowed number of bullets."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Every bullet is the same size and colour
+        self.width = self.settings.bullet_width
+        self.height = self.settings.bullet_height
+        self.colour = self.settings.bullet_colour
+
+        # left is each bullet's x-coordinate, y its exact vertical position and
+        # top the y-coordinate it's drawn at, like rect.y
+        capacity = max(self.settings.bullets_allowed, 1)
+        self.left = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.top = np.zeros(capacity, dtype=np.int64)
+
+        # Each bullet's position before the last logic step, for interpolation
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+
+        # Slots [0, count) hold live bullets
+        self.count = 0
+
+    def __len__(self):
+        """Return the number of live bullets."""
+        return self.count
+
+    def __bool__(self):
+        """A pool is true while any bullet is in flight."""
+        return self.count > 0
+
+    def _grow(self):
+        """Double the pool's capacity, keeping the live bullets."""
+        capacity = 2 * len(self.left)
+        for name in ('left', 'y', 'top', 'prev_y'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def fire(self, midtop):
+        """Launch a bullet with its top centre at midtop."""
+        if self.count == len(self.left):
+            self._grow()
+
+        x, y = midtop
+        slot = self.count
+        self.left[slot] = x - self.width // 2
+        self.y[slot] = y
+        self.prev_y[slot] = y
+        self.top[slot] = y
+        self.count += 1
+
+    def empty(self):
+        """Remove every bullet; the slots are kept for reuse."""
+        self.count = 0
+
+    def set_bullets(self, lefts, ys):
+        """Replace the live bullets with ones at the given positions."""
+        count = len(lefts)
+        while len(self.left) < count:
+            self._grow()
+        self.left[:count] = lefts
+        self.y[:count] = ys
+        self.prev_y[:count] = ys
+        self.top[:count] = to_pixels(self.y[:count])
+        self.count = count
+
+    def remember_positions(self):
+        """Store the current positions before a logic step moves the bullets."""
+        self.prev_y[:self.count] = self.y[:self.count]
+
+    def positions(self, alpha=1.0):
+        """
+        Return the pixel coordinates of the live bullets.
+
+        With alpha below 1 the bullets are placed that fraction of the way
+        from where they were before the last logic step to where they are now.
+        """
+        n = self.count
+        if alpha >= 1.0:
+            return self.left[:n], self.top[:n]
+        prev_y = self.prev_y[:n]
+        return self.left[:n], to_pixels(prev_y + (self.y[:n] - prev_y) * alpha)
+
+    def update(self):
+        """Move every bullet up the screen and drop the ones that have left it."""
+        n = self.count
+        if not n:
+            return
+
+        y = self.y[:n]
+        y -= self.settings.bullet_speed
+        top = self.top[:n]
+        top[:] = to_pixels(y)
+
+        # Bullets are only culled once their bottom edge passes the top of
+        # the screen, as before
+        keep = top + self.height > 0
+        if keep.all():
+            return
+
+        # Slide the surviving bullets to the front, keeping their order
+        kept = int(np.count_nonzero(keep))
+        self.left[:kept] = self.left[:n][keep]
+        self.y[:kept] = y[keep]
+        self.top[:kept] = top[keep]
+        self.prev_y[:kept] = self.prev_y[:n][keep]
+        self.count = kept
+
+    def rects(self):
+        """Return the left, top, width and height of every live bullet as arrays."""
+        n = self.count
+        return (self.left[:n], self.top[:n],
+                np.full(n, self.width, dtype=np.int64),
+                np.full(n, self.height, dtype=np.int64))
+
+    def draw(self, surface, alpha=1.0):
+        """Draw every live bullet onto surface, interpolated by alpha."""
+        xs, ys = self.positions(alpha)
+
+        # fill() shifts a rect that starts above the surface down to its top
+        # edge rather than clipping it, so clip bullets leaving the screen here
+        bottoms = ys + self.height
+        ys = np.maximum(ys, 0)
+        heights = bottoms - ys
+        for x, y, height in zip(xs.tolist(), ys.tolist(), heights.tolist()):
+            surface.fill(self.colour, (x, y, self.width, height))
+
+    def sprites(self):
+        """Return a Bullet sprite for each live bullet, e.g. for debugging."""
+        bullets = []
+        for x, y in zip(self.left[:self.count].tolist(), self.y[:self.count].tolist()):
+            bullet = Bullet(self.ai_game)
+            bullet.rect.x = x
+            bullet.y = y
+            bullet.rect.y = bullet.y
+            bullets.append(bullet)
+        return bullets
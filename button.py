@@ -1,5 +1,7 @@
 import pygame.font  # Lets Pygame render text to the screen
 
+from text_cache import TextCache
+
 class Button:
     """A class to build buttons for the game."""
 
@@ -14,7 +16,8 @@ class Button:
         self.width, self.height = 200, 50
         self.button_colour = (0, 135, 0)
         self.text_colour = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.get_font(48)
+        self.text_cache = TextCache(self.font, self.text_colour, self.button_colour)
 
         # Create a rectangular area for the button and position it at the screen centre
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -30,9 +33,10 @@ class Button:
         - Converts the text (msg) into a graphical image that can be drawn to the screen.
         - Centers the text image inside the button rectangle.
         """
-        # Create a rendered image of the text with anti-aliasing (True)
+        # Create a rendered image of the text with anti-aliasing
         # The background of the text matches the button colour
-        self.msg_image = self.font.render(msg, True, self.text_colour, self.button_colour)
+        # The cache means changing back to an earlier message doesn't render it again
+        self.msg_image = self.text_cache.render(msg)
 
         # Get the rectangle of the rendered text image
         self.msg_image_rect = self.msg_image.get_rect()
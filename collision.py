@@ -0,0 +1,170 @@
+import math
+
+import numpy as np
+
+class BruteForceCollider:
+    """Resolve bullet-alien collisions by testing every bullet against every alien."""
+
+    def __init__(self, ai_game):
+        """Initialise the collider for the game's fleet."""
+        self.fleet = ai_game.aliens
+
+    def collide_bullets(self, bullets):
+        """
+        Destroy every alien touched by a bullet and return how many died.
+
+        Like groupcollide(bullets, aliens, False, True), bullets survive and
+        an alien hit by several bullets in one frame is only destroyed once.
+        """
+        if not self.fleet or not bullets:
+            return 0
+
+        hit = self.fleet.overlaps(*bullets.rects()).any(axis=0)
+        return self.fleet.kill(hit)
+
+
+class GridCollider:
+    """
+    Resolve bullet-alien collisions with a uniform grid over the fleet.
+
+    Aliens are bucketed into cells the size of one fleet slot (by default two
+    alien widths by two alien heights), so each bullet is only tested against the
+    handful of aliens in the cells it covers. Each fleet moves as a whole, so
+    the grid is built once per formation in every fleet's starting
+    coordinates, and bullets are shifted by how far that fleet has moved
+    since; aliens are removed from their cells as they die. A bullet is only
+    looked up in the fleets whose bounding boxes it touches.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the collider for the game's fleet."""
+        self.fleet = ai_game.aliens
+
+        # Each cell is one fleet slot: an alien plus the gap to the next one
+        spacing = max(ai_game.settings.fleet_spacing, 1)
+        self.cell_width = spacing * self.fleet.alien_width
+        self.cell_height = spacing * self.fleet.alien_height
+
+        # Maps (fleet, column, row) to the indices of the live aliens in that
+        # cell, and each alien's index to the cells it's in
+        self.cells = {}
+        self.alien_cells = {}
+
+        # The fleet generation the grid was built for, and where each fleet's
+        # first alien was at the time, used to measure how far it has moved
+        self.generation = None
+        self.origin_x = np.zeros(0)
+        self.origin_y = np.zeros(0)
+
+    def _cell_range(self, start, end, size):
+        """Return the range of cell indices covering [start, end)."""
+        return range(math.floor(start / size), math.floor((end - 1) / size) + 1)
+
+    def _rebuild(self):
+        """Bucket every live alien in the fleet into the grid."""
+        self.cells = {}
+        self.alien_cells = {}
+        self.generation = self.fleet.generation
+        if not len(self.fleet.x):
+            return
+
+        starts = self.fleet.starts
+        self.origin_x = self.fleet.x[starts].copy()
+        self.origin_y = self.fleet.y[starts].copy()
+
+        width, height = self.fleet.alien_width, self.fleet.alien_height
+        fleet_of = self.fleet.fleet_of.tolist()
+        for index in np.flatnonzero(self.fleet.alive).tolist():
+            left, top = self.fleet.left[index], self.fleet.top[index]
+            fleet = fleet_of[index]
+            # An alien that isn't aligned with the grid can cover several cells
+            keys = [(fleet, column, row)
+                    for column in self._cell_range(left, left + width, self.cell_width)
+                    for row in self._cell_range(top, top + height, self.cell_height)]
+            for key in keys:
+                self.cells.setdefault(key, set()).add(index)
+            self.alien_cells[index] = keys
+
+    def collide_bullets(self, bullets):
+        """
+        Destroy every alien touched by a bullet and return how many died.
+
+        Gives the same result as BruteForceCollider.collide_bullets().
+        """
+        if not self.fleet or not bullets:
+            return 0
+
+        if self.generation != self.fleet.generation:
+            self._rebuild()
+
+        # How far each fleet has moved since the grid was built. Aliens are
+        # rounded to whole pixels individually, so widen each query by a
+        # pixel either side and leave the exact test to the real positions.
+        starts = self.fleet.starts
+        dxs = (self.fleet.x[starts] - self.origin_x).tolist()
+        dys = (self.fleet.y[starts] - self.origin_y).tolist()
+
+        rects = bullets.rects()
+        if self.fleet.fleet_count == 1:
+            pairs = ((bullet, 0) for bullet in range(len(rects[0])))
+        else:
+            # Pair each bullet with the fleets whose bounding boxes it touches
+            left, top, width, height = rects
+            box_left, box_top, box_right, box_bottom = self.fleet.boxes()
+            near = ((self.fleet.live_counts > 0)
+                    & (left[:, None] < box_right) & (left[:, None] + width[:, None] > box_left)
+                    & (top[:, None] < box_bottom) & (top[:, None] + height[:, None] > box_top))
+            pairs = zip(*(array.tolist() for array in np.nonzero(near)))
+
+        candidates = set()
+        lefts, tops, widths, heights = (array.tolist() for array in rects)
+        for bullet, fleet in pairs:
+            bullet_left, bullet_top = lefts[bullet], tops[bullet]
+            dx, dy = dxs[fleet], dys[fleet]
+            columns = self._cell_range(bullet_left - dx - 1,
+                                       bullet_left + widths[bullet] - dx + 1, self.cell_width)
+            rows = self._cell_range(bullet_top - dy - 1,
+                                    bullet_top + heights[bullet] - dy + 1, self.cell_height)
+            for column in columns:
+                for row in rows:
+                    candidates.update(self.cells.get((fleet, column, row), ()))
+
+        if not candidates:
+            return 0
+
+        # Test the nearby aliens exactly, the same way the brute-force check does
+        indices = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        hit = self.fleet.overlaps(*rects, indices).any(axis=0)
+        dead = indices[hit]
+
+        mask = np.zeros(len(self.fleet.alive), dtype=bool)
+        mask[dead] = True
+        killed = self.fleet.kill(mask)
+        self._forget(dead)
+        return killed
+
+    def _forget(self, indices):
+        """Remove dead aliens from the cells that hold them."""
+        for index in indices.tolist():
+            for key in self.alien_cells.pop(index, ()):
+                members = self.cells[key]
+                members.discard(index)
+                if not members:
+                    del self.cells[key]
+
+
+# Collision backends that can be chosen with Settings.collision_backend
+COLLIDERS = {
+    'brute_force': BruteForceCollider,
+    'grid': GridCollider,
+}
+
+def create_collider(ai_game):
+    """Return the collision backend named by the game's settings."""
+    try:
+        collider_class = COLLIDERS[ai_game.settings.collision_backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown collision backend: {ai_game.settings.collision_backend!r}"
+        ) from None
+    return collider_class(ai_game)
@@ -0,0 +1,319 @@
+import multiprocessing
+import queue
+import signal
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from replay import encode_event, decode_event
+
+# The start of the shared memory holds the number of the last frame published
+CONTROL = struct.Struct('<q')
+
+# Each slot starts with a sequence number, odd while the slot is being
+# written, followed by what's needed to draw the frame besides the arrays:
+# frame count, game active, ship x, ship movement flags, score, high score,
+# level, ships left, alien count, bullet count and the fleet's revision
+SEQUENCE = struct.Struct('<q')
+FRAME = struct.Struct('<I?d??qqHHIIq')
+
+
+def _aligned(size):
+    """Round size up to a multiple of 8 bytes."""
+    return (size + 7) // 8 * 8
+
+
+class DrawListRing:
+    """
+    A ring buffer of draw lists in shared memory, from the logic to the renderer.
+
+    A draw list is everything needed to draw one frame: the pixel positions
+    of the aliens and bullets, which aliens are alive, where the ship is and
+    the numbers on the HUD. The logic writes each frame into the next slot
+    and the renderer copies out the newest complete one. There are no locks:
+    each slot's sequence number is odd while it's being written and is
+    checked again after copying, so a reader that was overtaken just retries.
+    """
+
+    # Enough slots that the renderer is never still copying a slot when the
+    # logic comes round to it again
+    slots = 4
+
+    def __init__(self, alien_total, bullet_capacity, name=None):
+        """Create the shared memory, or attach to the one called name."""
+        self.alien_total = alien_total
+        self.bullet_capacity = bullet_capacity
+
+        # Each slot: sequence and frame, then alien left and top and bullet
+        # left and top (int32), then whether each alien is alive (uint8)
+        self.header_size = _aligned(SEQUENCE.size + FRAME.size)
+        self.slot_size = _aligned(self.header_size + 8 * alien_total
+                                  + 8 * bullet_capacity + alien_total)
+        size = CONTROL.size + self.slots * self.slot_size
+
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            CONTROL.pack_into(self.memory.buf, 0, -1)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.buf = self.memory.buf
+
+        # NumPy views of each slot's arrays
+        self.views = [self._slot_views(slot) for slot in range(self.slots)]
+
+        # Frames published by this end, and the last frame copied out at the other
+        self.published = -1
+        self.applied = -1
+
+        # The logic's fleet revision in the last frame applied
+        self.fleet_revision = None
+
+    @property
+    def spec(self):
+        """Return the arguments another process needs to attach to this ring."""
+        return self.alien_total, self.bullet_capacity, self.memory.name
+
+    def _slot_offset(self, slot):
+        return CONTROL.size + slot * self.slot_size
+
+    def _slot_views(self, slot):
+        """Return arrays viewing the alien and bullet positions in a slot."""
+        offset = self._slot_offset(slot) + self.header_size
+        views = {}
+        for name, dtype, count in (('alien_left', np.int32, self.alien_total),
+                                   ('alien_top', np.int32, self.alien_total),
+                                   ('bullet_left', np.int32, self.bullet_capacity),
+                                   ('bullet_top', np.int32, self.bullet_capacity),
+                                   ('alive', np.uint8, self.alien_total)):
+            views[name] = np.ndarray(count, dtype=dtype, buffer=self.buf, offset=offset)
+            offset += views[name].nbytes
+        return views
+
+    def publish(self, ai_game):
+        """Write the game's current frame into the next slot."""
+        frame = self.published + 1
+        slot = frame % self.slots
+        offset = self._slot_offset(slot)
+
+        # Odd while writing, so a reader knows not to trust the slot
+        SEQUENCE.pack_into(self.buf, offset, 2 * frame + 1)
+
+        fleet = ai_game.aliens
+        bullets = ai_game.bullets
+        ship = ai_game.ship
+        stats = ai_game.stats
+        alien_count = len(fleet.x)
+        bullet_count = min(bullets.count, self.bullet_capacity)
+        FRAME.pack_into(self.buf, offset + SEQUENCE.size,
+                        ai_game.frame_count, ai_game.game_active,
+                        ship.x, ship.moving_left, ship.moving_right,
+                        stats.score, stats.high_score, stats.level, stats.ship_left,
+                        alien_count, bullet_count, fleet.revision)
+
+        # A fleet loaded from a snapshot can be a different size from the
+        # ones the game builds, so only the aliens there are now are copied
+        views = self.views[slot]
+        np.copyto(views['alien_left'][:alien_count], fleet.left, casting='unsafe')
+        np.copyto(views['alien_top'][:alien_count], fleet.top, casting='unsafe')
+        np.copyto(views['alive'][:alien_count], fleet.alive, casting='unsafe')
+        np.copyto(views['bullet_left'][:bullet_count], bullets.left[:bullet_count],
+                  casting='unsafe')
+        np.copyto(views['bullet_top'][:bullet_count], bullets.top[:bullet_count],
+                  casting='unsafe')
+
+        SEQUENCE.pack_into(self.buf, offset, 2 * frame + 2)
+        CONTROL.pack_into(self.buf, 0, frame)
+        self.published = frame
+
+    def _read_latest(self):
+        """Return the newest complete frame's header and arrays, or None if there's nothing new."""
+        for _ in range(self.slots):
+            frame, = CONTROL.unpack_from(self.buf, 0)
+            if frame < 0 or frame == self.applied:
+                return None
+
+            offset = self._slot_offset(frame % self.slots)
+            sequence, = SEQUENCE.unpack_from(self.buf, offset)
+            if sequence != 2 * frame + 2:
+                # Already being overwritten with a newer frame
+                continue
+
+            header = FRAME.unpack_from(self.buf, offset + SEQUENCE.size)
+            arrays = {name: view.copy() for name, view in self.views[frame % self.slots].items()}
+            if SEQUENCE.unpack_from(self.buf, offset)[0] == sequence:
+                self.applied = frame
+                return header, arrays
+        return None
+
+    def apply(self, ai_game):
+        """
+        Make ai_game draw the newest published frame.
+
+        Only what the renderer looks at is copied, and each part only when it
+        changed, so the renderer can tell what needs redrawing as usual.
+        Returns False if no new frame has been published since the last call.
+        """
+        latest = self._read_latest()
+        if latest is None:
+            return False
+
+        ((frame_count, game_active, ship_x, moving_left, moving_right,
+          score, high_score, level, ship_left, alien_count, bullet_count, fleet_revision),
+         arrays) = latest
+
+        fleet = ai_game.aliens
+        if fleet_revision != self.fleet_revision:
+            self.fleet_revision = fleet_revision
+            left = arrays['alien_left'][:alien_count]
+            top = arrays['alien_top'][:alien_count]
+            if len(fleet.x) != alien_count:
+                # The logic built a fleet of another size; only the pixel
+                # positions are drawn here, so one fleet of them will do
+                fleet.set_positions(left, top)
+            np.copyto(fleet.left, left)
+            np.copyto(fleet.top, top)
+            np.copyto(fleet.alive, arrays['alive'][:alien_count], casting='unsafe')
+            fleet.count = int(np.count_nonzero(fleet.alive))
+            fleet.revision += 1
+
+        ai_game.bullets.set_bullets(arrays['bullet_left'][:bullet_count],
+                                    arrays['bullet_top'][:bullet_count])
+
+        ship = ai_game.ship
+        ship.x = ship.prev_x = ship_x
+        ship.rect.x = ship_x
+        ship.moving_left, ship.moving_right = moving_left, moving_right
+
+        stats = ai_game.stats
+        stats.score, stats.high_score = score, high_score
+        stats.level, stats.ship_left = level, ship_left
+        sb = ai_game.sb
+        sb.prep_score()
+        sb.prep_high_score()
+        sb.prep_level()
+        sb.prep_ships()
+
+        if game_active != ai_game.game_active:
+            ai_game.game_active = game_active
+            pygame.mouse.set_visible(not game_active)
+        ai_game.frame_count = frame_count
+        return True
+
+    def close(self):
+        """Detach from the shared memory."""
+        # The views have to go first, or the memory can't be unmapped
+        self.views = []
+        self.buf = None
+        self.memory.close()
+
+    def unlink(self):
+        """Free the shared memory, once every process has closed it."""
+        self.memory.unlink()
+
+
+class SimulationProcess:
+    """
+    Run a game's logic in a process of its own, publishing draw lists.
+
+    The process steps the logic at Settings.frame_rate however long frames
+    take to draw. Input is sent to it as (kind, key, x, y) records, as
+    stored in recordings, and it keeps the recording and the high scores.
+    """
+
+    def __init__(self, ai_game, record_path=None):
+        """Start the process from ai_game's current state."""
+        # Room for the current fleet, which may have been loaded from a
+        # snapshot, and for the fleets the game builds from now on
+        fleet = ai_game.aliens
+        self.ring = DrawListRing(max(len(fleet.x), len(fleet.layout())),
+                                 max(ai_game.settings.bullets_allowed, 1))
+
+        # spawn starts a fresh interpreter, rather than a fork of this
+        # process's display and event handling
+        context = multiprocessing.get_context('spawn')
+        self.inputs = context.Queue()
+        self.results = context.Queue()
+        self.stop_event = context.Event()
+        self.process = context.Process(
+            target=_run_simulation, daemon=True,
+            args=(ai_game.settings, self.ring.spec, self.inputs, self.stop_event,
+                  self.results, ai_game.snapshot(), record_path))
+        self.process.start()
+
+    def send(self, events):
+        """Pass the events the logic responds to on to the process."""
+        for event in events:
+            record = encode_event(event)
+            if record is not None:
+                self.inputs.put(record)
+
+    def stop(self, timeout=5.0):
+        """
+        Stop the process and return a snapshot of where its game ended up.
+
+        Returns None if the process had already died without one.
+        """
+        self.stop_event.set()
+        try:
+            state = self.results.get(timeout=timeout)
+        except queue.Empty:
+            state = None
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
+        self.ring.unlink()
+        return state
+
+
+def _run_simulation(settings, ring_spec, inputs, stop_event, results, state, record_path):
+    """Step a game's logic and publish a draw list every frame, until told to stop."""
+    # The window's process decides when to quit, e.g. on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Imported here so the game can import this module
+    from alien_invasion import AlienInvasion
+    from high_scores import HighScoreStore
+
+    # A headless game, but one that plays like the real thing: with pauses,
+    # and keeping the player's high scores
+    settings.split_process = False
+    skip_pauses = settings.skip_pauses
+    ai_game = AlienInvasion(headless=True, settings=settings)
+    settings.skip_pauses = skip_pauses
+    ai_game.high_scores = HighScoreStore(settings.high_score_file, settings.high_score_entries)
+    ai_game.stats.high_score = ai_game.high_scores.best()
+    ai_game.restore(state)
+    if record_path:
+        ai_game.record(record_path)
+
+    ring = DrawListRing(*ring_spec)
+    try:
+        while not stop_event.is_set():
+            events = []
+            while True:
+                try:
+                    events.append(decode_event(*inputs.get_nowait()))
+                except queue.Empty:
+                    break
+
+            if ai_game.recorder:
+                ai_game.recorder.record_frame(events)
+            try:
+                for event in events:
+                    ai_game._handle_event(event)
+            except SystemExit:
+                # The player quit
+                break
+
+            if ai_game.game_active:
+                ai_game.step()
+            ring.publish(ai_game)
+
+            ai_game.clock.tick(settings.frame_rate)
+    finally:
+        ai_game.shut_down()
+        ring.close()
+        results.put(ai_game.snapshot())
@@ -0,0 +1,164 @@
+import numpy as np
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+from policies import ACTION_COUNT, apply_action
+
+class AlienInvasionEnv:
+    """
+    A Gym-style environment for training agents on one headless game.
+
+    Observations are NumPy arrays of positions rather than rendered pixels:
+      aliens   (max_aliens, 3) float32: x, y, alive (1.0 or 0.0)
+      bullets  (max_bullets, 3) float32: x, y, in flight (1.0 or 0.0)
+      ship_x   float32: the ship's x position
+    Actions are integers below ACTION_COUNT, as in policies.py. The reward for
+    a step is how much the score went up, and an episode is done when the
+    last ship is lost or max_frames steps have been taken.
+    """
+
+    def __init__(self, settings=None, max_frames=36000):
+        """Create the headless game and size the observation arrays."""
+        self.game = AlienInvasion(headless=True, settings=settings)
+        self.settings = self.game.settings
+        self.max_frames = max_frames
+        self.action_count = ACTION_COUNT
+
+        # The game builds its first fleet as it starts up; every fleet has the
+        # same layout, so this is the most aliens there will ever be
+        self.max_aliens = len(self.game.aliens.x)
+        self.max_bullets = self.settings.bullets_allowed
+
+    def observation_shapes(self):
+        """Return the shape of each observation array."""
+        return {
+            'aliens': (self.max_aliens, 3),
+            'bullets': (self.max_bullets, 3),
+            'ship_x': (),
+        }
+
+    def _new_observation(self):
+        """Return zeroed arrays to hold one observation."""
+        return {name: np.zeros(shape, dtype=np.float32)
+                for name, shape in self.observation_shapes().items()}
+
+    def observe(self, aliens, bullets):
+        """Write the game's state into the given arrays and return the ship's x."""
+        fleet = self.game.aliens
+        count = len(fleet.x)
+        aliens[count:] = 0.0
+        aliens[:count, 0] = fleet.x
+        aliens[:count, 1] = fleet.y
+        aliens[:count, 2] = fleet.alive
+
+        pool = self.game.bullets
+        count = pool.count
+        bullets[count:] = 0.0
+        bullets[:count, 0] = pool.left[:count]
+        bullets[:count, 1] = pool.y[:count]
+        bullets[:count, 2] = 1.0
+
+        return self.game.ship.x
+
+    def _observation(self):
+        """Return a new observation of the game."""
+        observation = self._new_observation()
+        observation['ship_x'] = np.float32(
+            self.observe(observation['aliens'], observation['bullets']))
+        return observation
+
+    def _info(self):
+        """Return the statistics reported alongside each step."""
+        stats = self.game.stats
+        return {'score': stats.score, 'level': stats.level,
+                'ships_left': stats.ship_left, 'frames': self.game.frame_count}
+
+    def reset(self, seed=None):
+        """
+        Start a new game and return its first observation.
+
+        seed is accepted for compatibility; the game itself has no randomness.
+        """
+        self.game.start_game()
+        return self._observation()
+
+    def advance(self, action):
+        """Take one action and step the game; return (reward, done)."""
+        game = self.game
+        score = game.stats.score
+
+        apply_action(game, action)
+        game.step()
+
+        reward = game.stats.score - score
+        done = not game.game_active or game.frame_count >= self.max_frames
+        return reward, done
+
+    def step(self, action):
+        """Take one action and return (observation, reward, done, info)."""
+        reward, done = self.advance(action)
+        info = self._info()
+        info['truncated'] = done and self.game.game_active
+        return self._observation(), reward, done, info
+
+
+class VectorAlienInvasionEnv:
+    """
+    A batch of headless games stepped together with one call.
+
+    Observations have the same arrays as AlienInvasionEnv with an extra
+    leading dimension of num_envs. They're written into the same arrays on
+    every call, so copy them if they need to be kept. A game that finishes
+    is reset straight away; its last statistics are reported in the infos.
+    """
+
+    def __init__(self, num_envs, settings_overrides=None, max_frames=36000):
+        """Create num_envs games and the batched observation arrays."""
+        self.envs = []
+        for _ in range(num_envs):
+            settings = Settings()
+            settings.override(**(settings_overrides or {}))
+            self.envs.append(AlienInvasionEnv(settings, max_frames))
+
+        self.num_envs = num_envs
+        self.action_count = ACTION_COUNT
+
+        shapes = self.envs[0].observation_shapes()
+        self.observations = {name: np.zeros((num_envs,) + shape, dtype=np.float32)
+                             for name, shape in shapes.items()}
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+    def _observe(self, index):
+        """Write game index's state into row index of the observation arrays."""
+        observations = self.observations
+        observations['ship_x'][index] = self.envs[index].observe(
+            observations['aliens'][index], observations['bullets'][index])
+
+    def reset(self, seed=None):
+        """Start every game afresh and return the batched observations."""
+        for index, env in enumerate(self.envs):
+            env.reset(seed)
+            self._observe(index)
+        return self.observations
+
+    def step(self, actions):
+        """
+        Take one action in every game.
+
+        Returns (observations, rewards, dones, infos); infos has one dict per
+        game, holding its final statistics if it finished on this step.
+        """
+        infos = [{} for _ in self.envs]
+        for index, env in enumerate(self.envs):
+            reward, done = env.advance(int(actions[index]))
+            self.rewards[index] = reward
+            self.dones[index] = done
+
+            if done:
+                infos[index] = env._info()
+                infos[index]['truncated'] = env.game.game_active
+                env.reset()
+            self._observe(index)
+
+        return self.observations, self.rewards, self.dones, infos
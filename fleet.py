@@ -0,0 +1,423 @@
+import numpy as np
+
+from alien import Alien
+
+def to_pixels(values):
+    """Round an array of positions the way Rect does when floats are assigned to it."""
+    # Rect rounds half away from zero
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+def build_layout(screen_width, screen_height, alien_width, alien_height, spacing):
+    """Return arrays of x and y positions filling the screen with aliens."""
+    # Create an alien and keep adding aliens until there's no room left.
+    # Spacing between aliens is one alien width and one alien height by
+    # default; Settings.fleet_spacing changes how densely they're packed
+
+    # Initial x- and y-values: one alien width in from the left and one alien height
+    # down from the top
+    current_x, current_y = alien_width, alien_height
+
+    # Collect the position of every alien
+    xs, ys = [], []
+
+    # Keep adding aliens while there is enough vertical space on the screen
+    while current_y < (screen_height - 3 * alien_height):
+
+        # Keep adding aliens while there is enough horizontal space on the screen
+        while current_x < (screen_width - 2 * alien_width):
+            xs.append(current_x)
+            ys.append(current_y)
+
+            # Move to the position for the next alien, leaving a gap equal to one alien width
+            current_x += spacing * alien_width
+
+        # Finished a row; reset x value and increment y value
+        current_x = alien_width
+        current_y += spacing * alien_height
+
+    return np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)
+
+
+def split_rows(ys, fleet_count):
+    """
+    Return where each fleet starts when a layout's rows are shared out.
+
+    The rows are split, top to bottom, into fleet_count bands of (nearly)
+    equal size; each band is one fleet. There are never more fleets than rows.
+    """
+    row_starts = np.flatnonzero(np.diff(ys, prepend=np.nan) != 0)
+    if not len(row_starts):
+        return row_starts
+    bands = np.array_split(np.arange(len(row_starts)), min(fleet_count, len(row_starts)))
+    return row_starts[[band[0] for band in bands]]
+
+
+class FleetLayout:
+    """A precomputed fleet formation, shared by every fleet that uses it."""
+
+    def __init__(self, xs, ys, fleet_count=1):
+        """Store the positions, and their pixel coordinates, as read-only arrays."""
+        self.x = xs
+        self.y = ys
+        self.left = to_pixels(xs)
+        self.top = to_pixels(ys)
+
+        # The index of the first alien of each fleet in the formation, and
+        # of each fleet's outermost aliens
+        self.starts = split_rows(ys, fleet_count)
+        ends = np.append(self.starts[1:], len(xs))
+        extremes = [(start + np.argmin(xs[start:end]), start + np.argmax(xs[start:end]),
+                     start + np.argmin(ys[start:end]), start + np.argmax(ys[start:end]))
+                    for start, end in zip(self.starts.tolist(), ends.tolist())]
+        self.leftmost, self.rightmost, self.topmost, self.bottommost = (
+            np.array(extremes, dtype=np.int64).reshape(-1, 4).T.copy())
+        for array in (self.x, self.y, self.left, self.top, self.starts,
+                      self.leftmost, self.rightmost, self.topmost, self.bottommost):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.x)
+
+
+class Fleet:
+    """
+    A class to manage the alien fleets as a structure of arrays.
+
+    The position and state of every alien is stored in contiguous NumPy arrays,
+    so moving the fleets, dropping them and testing them against other rects
+    are each a single vectorised operation. Alien sprites are only created
+    when something asks for them.
+
+    The aliens can be split into several fleets (Settings.fleet_count), each
+    a contiguous run of the arrays with its own direction, speed and drop
+    distance. Every fleet keeps a bounding box of its live aliens, so edge
+    and bottom checks look at one box per fleet instead of every alien.
+    """
+
+    # Layouts already worked out, keyed by screen size, alien size, spacing
+    # and number of fleets
+    layouts = {}
+
+    def __init__(self, ai_game):
+        """Initialise an empty fleet."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.screen_rect = self.screen.get_rect()
+        self.settings = ai_game.settings
+
+        # Every alien shares one image, so the fleet only needs its size
+        self.image = ai_game.assets.get_sprite('alien')
+        self.alien_width, self.alien_height = self.image.get_size()
+
+        # x holds each alien's exact horizontal position, y its row position,
+        # and alive whether it's still in the fleet
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.alive = np.zeros(0, dtype=bool)
+
+        # Positions before the last logic step, used to draw the fleet part of
+        # the way between steps when logic and rendering run at different rates
+        self.prev_x = np.zeros(0, dtype=np.float64)
+        self.prev_y = np.zeros(0, dtype=np.float64)
+
+        # The pixel coordinates the aliens are drawn at, like rect.x and rect.y,
+        # refreshed whenever the fleet moves
+        self.left = np.zeros(0, dtype=np.int64)
+        self.top = np.zeros(0, dtype=np.int64)
+
+        # Number of aliens still alive, kept so len() doesn't scan the arrays
+        self.count = 0
+
+        # The index of each fleet's first alien, how many aliens each fleet
+        # has room for, how many are still alive, and which fleet each alien
+        # belongs to
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.sizes = np.zeros(0, dtype=np.int64)
+        self.live_counts = np.zeros(0, dtype=np.int64)
+        self.fleet_of = np.zeros(0, dtype=np.int64)
+
+        # How each fleet moves: 1 for right or -1 for left, a multiple of
+        # Settings.alien_speed, and how far it drops at an edge
+        self.directions = np.zeros(0, dtype=np.float64)
+        self.speed_scales = np.zeros(0, dtype=np.float64)
+        self.drop_distances = np.zeros(0, dtype=np.float64)
+
+        # Each fleet's bounding box, held as the indices of its leftmost,
+        # rightmost, top and bottom live aliens. A whole fleet moves together,
+        # so the same aliens stay on the outside until one of them dies.
+        self.leftmost = np.zeros(0, dtype=np.int64)
+        self.rightmost = np.zeros(0, dtype=np.int64)
+        self.topmost = np.zeros(0, dtype=np.int64)
+        self.bottommost = np.zeros(0, dtype=np.int64)
+
+        # Bumped whenever the fleet is replaced, so anything indexing the
+        # aliens (like a collision grid) knows to rebuild
+        self.generation = 0
+
+        # Bumped whenever any alien moves or dies, so a renderer can tell
+        # whether the fleet needs redrawing
+        self.revision = 0
+
+    def __len__(self):
+        """Return the number of aliens still in the fleet."""
+        return self.count
+
+    def __bool__(self):
+        """A fleet is true while it still has aliens in it."""
+        return self.count > 0
+
+    @property
+    def fleet_count(self):
+        """Return the number of fleets."""
+        return len(self.starts)
+
+    def set_positions(self, xs, ys, starts=None):
+        """
+        Replace the fleets with live aliens at the given positions.
+
+        starts gives the index of each fleet's first alien; by default all
+        the aliens are one fleet.
+        """
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.count = len(self.x)
+        self.generation += 1
+        self.revision += 1
+        self._update_pixels()
+
+        if starts is None:
+            starts = [0] if len(self.x) else []
+        # A layout's own starts array is kept, so reset_to_layout() can tell
+        # the fleets are already split the same way
+        self._set_fleets(np.asarray(starts, dtype=np.int64))
+
+    def _set_fleets(self, starts):
+        """Split the aliens into fleets beginning at starts, all alive."""
+        fleet_count = len(starts)
+        if fleet_count != len(self.starts):
+            self.directions = np.zeros(fleet_count, dtype=np.float64)
+            self.speed_scales = np.zeros(fleet_count, dtype=np.float64)
+            self.drop_distances = np.zeros(fleet_count, dtype=np.float64)
+            self.reset_movement()
+
+        self.starts = starts
+        self.sizes = np.diff(starts, append=len(self.x))
+        self.live_counts = self.sizes.copy()
+        self.fleet_of = np.repeat(np.arange(fleet_count), self.sizes)
+        for name in ('leftmost', 'rightmost', 'topmost', 'bottommost'):
+            setattr(self, name, starts.copy())
+        self._find_extremes(range(fleet_count))
+
+    def reset_movement(self):
+        """
+        Set every fleet's direction, speed and drop distance from the settings.
+
+        The first fleet sets off in Settings.fleet_direction and the others
+        alternate; each fleet down moves fleet_speed_step faster than the one
+        above it.
+        """
+        settings = self.settings
+        order = np.arange(len(self.directions))
+        self.directions[:] = np.where(order % 2, -settings.fleet_direction,
+                                      settings.fleet_direction)
+        self.speed_scales[:] = 1.0 + settings.fleet_speed_step * order
+        self.drop_distances[:] = settings.fleet_drop_speed
+
+    def _find_extremes(self, fleets):
+        """Find the outermost live aliens of each of the given fleets."""
+        for fleet in fleets:
+            if not self.live_counts[fleet]:
+                continue
+            start = self.starts[fleet]
+            live = np.flatnonzero(self.alive[start:start + self.sizes[fleet]]) + start
+            x, y = self.x[live], self.y[live]
+            self.leftmost[fleet] = live[np.argmin(x)]
+            self.rightmost[fleet] = live[np.argmax(x)]
+            self.topmost[fleet] = live[np.argmin(y)]
+            self.bottommost[fleet] = live[np.argmax(y)]
+
+    def layout(self):
+        """Return the layout for the current screen, spacing and fleet count, building it once."""
+        settings = self.settings
+        key = (settings.screen_width, settings.screen_height,
+               self.alien_width, self.alien_height, settings.fleet_spacing,
+               settings.fleet_count)
+        layout = self.layouts.get(key)
+        if layout is None:
+            layout = FleetLayout(*build_layout(*key[:5]), settings.fleet_count)
+            self.layouts[key] = layout
+        return layout
+
+    def reset_to_layout(self):
+        """
+        Fill the fleet with live aliens in the standard layout.
+
+        When the fleet already has room for the layout, its arrays are
+        overwritten in place, so a new fleet doesn't allocate anything.
+        """
+        layout = self.layout()
+        if len(self.x) != len(layout) or self.starts is not layout.starts:
+            self.set_positions(layout.x, layout.y, layout.starts)
+            return
+
+        for array, source in ((self.x, layout.x), (self.y, layout.y),
+                              (self.prev_x, layout.x), (self.prev_y, layout.y),
+                              (self.left, layout.left), (self.top, layout.top),
+                              (self.live_counts, self.sizes),
+                              (self.leftmost, layout.leftmost),
+                              (self.rightmost, layout.rightmost),
+                              (self.topmost, layout.topmost),
+                              (self.bottommost, layout.bottommost)):
+            np.copyto(array, source)
+        self.alive.fill(True)
+        self.count = len(layout)
+        self.generation += 1
+        self.revision += 1
+
+    def empty(self):
+        """Remove every alien from the fleets, keeping their arrays for the next ones."""
+        self.alive.fill(False)
+        self.count = 0
+        self.live_counts.fill(0)
+        self.generation += 1
+        self.revision += 1
+
+    def _update_pixels(self):
+        """Refresh the pixel coordinates from the exact positions."""
+        self.left = to_pixels(self.x)
+        self.top = to_pixels(self.y)
+
+    def remember_positions(self):
+        """Store the current positions before a logic step moves the fleet."""
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+
+    def positions(self, alpha=1.0):
+        """
+        Return the pixel coordinates of the live aliens.
+
+        With alpha below 1 the aliens are placed that fraction of the way from
+        where they were before the last logic step to where they are now.
+        """
+        alive = self.alive
+        if alpha >= 1.0:
+            return self.left[alive], self.top[alive]
+        x = self.prev_x[alive] + (self.x[alive] - self.prev_x[alive]) * alpha
+        y = self.prev_y[alive] + (self.y[alive] - self.prev_y[alive]) * alpha
+        return to_pixels(x), to_pixels(y)
+
+    def update(self):
+        """Move each fleet to the right or left at its own speed."""
+        velocities = self.settings.alien_speed * self.speed_scales * self.directions
+
+        # Dead aliens move too; it's cheaper than masking and they're never used
+        self.x += np.repeat(velocities, self.sizes)
+        self.left = to_pixels(self.x)
+        self.revision += 1
+
+    def check_edges(self):
+        """Return a boolean array of which fleets have an alien at an edge of the screen."""
+        left = self.left
+        return ((self.live_counts > 0)
+                & ((left[self.rightmost] + self.alien_width >= self.screen_rect.right)
+                   | (left[self.leftmost] <= 0)))
+
+    def change_direction(self, fleets):
+        """Drop the fleets selected by a boolean array, and turn them around."""
+        distances = np.where(fleets, self.drop_distances, 0.0)
+        self.y += np.repeat(distances, self.sizes)
+        self.top = to_pixels(self.y)
+        self.directions[fleets] *= -1
+        self.revision += 1
+
+    def check_bottom(self):
+        """Return True if any alien has reached the bottom of the screen."""
+        bottom = self.top[self.bottommost] + self.alien_height
+        return bool(np.any((self.live_counts > 0)
+                           & (bottom >= self.settings.screen_height)))
+
+    def boxes(self):
+        """Return the pixel left, top, right and bottom of each fleet's bounding box."""
+        left, top = self.left, self.top
+        return (left[self.leftmost], top[self.topmost],
+                left[self.rightmost] + self.alien_width,
+                top[self.bottommost] + self.alien_height)
+
+    def anchors(self, alpha=1.0):
+        """
+        Return where the first alien slot of each fleet is drawn, interpolated by alpha.
+
+        Every alien in a fleet moves by the same amount, so these change
+        whenever the fleets are drawn somewhere new.
+        """
+        starts = self.starts
+        if alpha >= 1.0:
+            return tuple(zip(self.left[starts].tolist(), self.top[starts].tolist()))
+        x = self.prev_x[starts] + (self.x[starts] - self.prev_x[starts]) * alpha
+        y = self.prev_y[starts] + (self.y[starts] - self.prev_y[starts]) * alpha
+        return tuple(zip(to_pixels(x).tolist(), to_pixels(y).tolist()))
+
+    def overlaps(self, left, top, width, height, indices=None):
+        """
+        Return a boolean matrix of which rects overlap which live aliens.
+
+        left, top, width and height are arrays with one entry per rect; the
+        result has one row per rect and one column per alien, or one column
+        per entry of indices if only some aliens should be tested. The test
+        is the same one Rect.colliderect() uses.
+        """
+        if indices is None:
+            alien_left, alien_top, alive = self.left, self.top, self.alive
+        else:
+            alien_left = self.left[indices]
+            alien_top = self.top[indices]
+            alive = self.alive[indices]
+
+        return ((left[:, None] < alien_left + self.alien_width)
+                & (left[:, None] + width[:, None] > alien_left)
+                & (top[:, None] < alien_top + self.alien_height)
+                & (top[:, None] + height[:, None] > alien_top)
+                & alive)
+
+    def collide_rect(self, rect):
+        """Return True if any live alien overlaps rect."""
+        # Only look at the aliens if rect is inside some fleet's bounding box
+        left, top, right, bottom = self.boxes()
+        if not np.any((self.live_counts > 0) & (rect.x < right) & (rect.right > left)
+                      & (rect.y < bottom) & (rect.bottom > top)):
+            return False
+
+        overlaps = self.overlaps(np.array([rect.x]), np.array([rect.y]),
+                                 np.array([rect.width]), np.array([rect.height]))
+        return bool(overlaps.any())
+
+    def kill(self, mask):
+        """Remove the aliens selected by a boolean mask and return how many died."""
+        mask = mask & self.alive
+        killed = int(np.count_nonzero(mask))
+        if killed:
+            self.alive[mask] = False
+            self.count -= killed
+            self.live_counts -= np.add.reduceat(mask, self.starts, dtype=np.int64)
+            self._find_extremes(np.unique(self.fleet_of[mask]).tolist())
+            self.revision += 1
+        return killed
+
+    def draw(self, surface, alpha=1.0):
+        """Draw every live alien onto surface, interpolated by alpha."""
+        xs, ys = self.positions(alpha)
+        surface.blits([(self.image, pos) for pos in zip(xs.tolist(), ys.tolist())], False)
+
+    def sprites(self):
+        """Return an Alien sprite for each live alien, e.g. for debugging."""
+        aliens = []
+        for x, y in zip(self.x[self.alive], self.top[self.alive]):
+            alien = Alien(self.ai_game)
+            alien.x = float(x)
+            alien.rect.x = alien.x
+            alien.rect.y = int(y)
+            aliens.append(alien)
+        return aliens
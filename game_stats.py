@@ -7,7 +7,8 @@ class GameStats:
         self.settings = ai_game.settings
         self.reset_stats()
 
-        # High socre should never be reset
+        # High socre should never be reset; the best saved score is loaded
+        # once the first frame has been drawn
         self.high_score = 0
 
     # We’ll call this method from __init__() so the statistics are set properly when 
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+
+class HighScoreStore:
+    """
+    A class to keep the best scores between sessions.
+
+    The file is only read the first time the scores are needed, and new
+    scores are only kept in memory until flush() is called, e.g. at game over
+    or when the game exits, so saving never happens in the middle of play.
+    With path=None nothing is read or written, which suits simulations.
+    """
+
+    def __init__(self, path, max_entries=10):
+        """Initialise the store; the file isn't touched yet."""
+        self.path = path
+        self.max_entries = max_entries
+
+        # The leaderboard, best first; None until it has been loaded
+        self._entries = None
+
+        # Whether there are scores that haven't been saved
+        self.dirty = False
+
+    @property
+    def entries(self):
+        """Return the leaderboard, best first, loading it if needed."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self):
+        """Read the leaderboard from the file, or start an empty one."""
+        if self.path is None:
+            return []
+        try:
+            with open(self.path) as file:
+                entries = json.load(file)['scores']
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            # A damaged file shouldn't stop the game from starting
+            print(f"Ignoring unreadable high scores in {self.path}: {error}", file=sys.stderr)
+            return []
+        return sorted(entries, key=lambda entry: entry['score'], reverse=True)
+
+    def best(self):
+        """Return the highest score recorded, or 0 if there isn't one."""
+        entries = self.entries
+        return entries[0]['score'] if entries else 0
+
+    def submit(self, score, level):
+        """Add a finished game's score to the leaderboard, in memory only."""
+        if score <= 0:
+            return
+        entries = self.entries
+        if len(entries) >= self.max_entries and score <= entries[-1]['score']:
+            return
+
+        entries.append({'score': score, 'level': level})
+        entries.sort(key=lambda entry: entry['score'], reverse=True)
+        del entries[self.max_entries:]
+        self.dirty = True
+
+    def flush(self):
+        """
+        Save the leaderboard if it has changed.
+
+        The scores are written to a temporary file that then replaces the old
+        one, so the file is never left half written.
+        """
+        if not self.dirty or self.path is None:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump({'scores': self._entries}, file, indent=2)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            # Keep the scores in memory and try again at the next flush
+            print(f"Couldn't save high scores to {self.path}: {error}", file=sys.stderr)
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.dirty = False
@@ -0,0 +1,96 @@
+import argparse
+import sys
+import tracemalloc
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+from alien import Alien
+from bullet import Bullet
+from benchmark import SCENARIOS
+
+
+def sprite_footprint(factory, count, rounds=2):
+    """Return the bytes allocated per object when count objects are made by factory."""
+    # The first objects made can come with one-off allocations, like free
+    # lists being filled, so the smallest of a few rounds is kept
+    smallest = None
+    for _ in range(rounds):
+        # The list is made first so only the objects themselves are measured
+        objects = [None] * count
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for index in range(count):
+                objects[index] = factory()
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        size = (after - before) / count
+        smallest = size if smallest is None else min(smallest, size)
+    return smallest
+
+
+def fleet_array_bytes(fleet):
+    """Return the bytes the fleet's per-alien arrays take for each alien."""
+    arrays = (fleet.x, fleet.y, fleet.prev_x, fleet.prev_y, fleet.left, fleet.top,
+              fleet.alive, fleet.fleet_of)
+    return sum(array.nbytes for array in arrays) / max(len(fleet.x), 1)
+
+
+def pool_array_bytes(pool):
+    """Return the bytes the bullet pool's arrays take for each slot."""
+    arrays = (pool.left, pool.y, pool.top, pool.prev_y)
+    return sum(array.nbytes for array in arrays) / len(pool.left)
+
+
+def report(overrides):
+    """Measure the aliens and bullets of a game with the given settings, as sprites and as arrays."""
+    settings = Settings()
+    settings.override(**overrides)
+    ai_game = AlienInvasion(headless=True, settings=settings)
+    fleet_size = len(ai_game.aliens.x)
+
+    alien_bytes = sprite_footprint(lambda: Alien(ai_game), fleet_size)
+    alien_array_bytes = fleet_array_bytes(ai_game.aliens)
+    return {
+        'fleet_size': fleet_size,
+        'alien_bytes': alien_bytes,
+        'alien_array_bytes': alien_array_bytes,
+        'bullet_bytes': sprite_footprint(lambda: Bullet(ai_game), fleet_size),
+        'bullet_array_bytes': pool_array_bytes(ai_game.bullets),
+        'fleet_sprites_kb': alien_bytes * fleet_size / 1024,
+        'fleet_arrays_kb': alien_array_bytes * fleet_size / 1024,
+    }
+
+
+def main():
+    """
+    Print how much memory each alien and bullet takes, as a sprite and in the arrays.
+
+    The game keeps its aliens and bullets in arrays; the sprite figures are
+    what the same aliens and bullets would take as objects.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the memory aliens and bullets take as sprites and as arrays.")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to measure (default: all): {', '.join(SCENARIOS)}")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    columns = ('alien B', 'alien arr B', 'bullet B', 'bullet arr B', 'sprites KB', 'arrays KB')
+    print(f"{'scenario':>22} {'aliens':>7}" + ''.join(f"{name:>14}" for name in columns))
+    for name in names:
+        result = report(SCENARIOS[name])
+        print(f"{name:>22} {result['fleet_size']:>7}"
+              f"{result['alien_bytes']:>14.0f}{result['alien_array_bytes']:>14.0f}"
+              f"{result['bullet_bytes']:>14.0f}{result['bullet_array_bytes']:>14.0f}"
+              f"{result['fleet_sprites_kb']:>14.1f}{result['fleet_arrays_kb']:>14.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
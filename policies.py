@@ -0,0 +1,74 @@
+import numpy as np
+
+# Actions a player (or bot) can take on a frame. The ship moves left, right
+# or not at all, and may fire; action = move + 3 * fire.
+STAY, LEFT, RIGHT = range(3)
+ACTION_COUNT = 6
+
+
+def apply_action(ai_game, action):
+    """Set the ship's movement flags and fire, as the keyboard would."""
+    move, fire = action % 3, action // 3
+    ai_game.ship.moving_left = move == LEFT
+    ai_game.ship.moving_right = move == RIGHT
+    if fire:
+        ai_game._fire_bullet()
+
+
+class RandomPolicy:
+    """A policy that holds a random action for a random number of frames."""
+
+    def __init__(self, rng, max_hold=30):
+        """Initialise the policy with a NumPy random generator."""
+        self.rng = rng
+        self.max_hold = max_hold
+        self.action = STAY
+        self.frames_left = 0
+
+    def act(self, ai_game):
+        """Return the action for this frame."""
+        if self.frames_left <= 0:
+            self.action = int(self.rng.integers(ACTION_COUNT))
+            self.frames_left = int(self.rng.integers(1, self.max_hold + 1))
+        self.frames_left -= 1
+        return self.action
+
+
+class TrackingPolicy:
+    """A scripted policy that chases the lowest alien and keeps firing."""
+
+    def __init__(self, rng, jitter=20):
+        """Initialise the policy; rng adds a little noise to where it aims."""
+        self.rng = rng
+        self.jitter = jitter
+        self.offset = 0
+
+    def act(self, ai_game):
+        """Return the action for this frame."""
+        fleet = ai_game.aliens
+        if not fleet:
+            return STAY + 3
+
+        # Aim under the lowest live alien, nudged by a bit of noise each time
+        # it picks a new target so seeded games play out differently
+        alive = np.flatnonzero(fleet.alive)
+        target = alive[np.argmax(fleet.top[alive])]
+        if self.rng.random() < 0.05:
+            self.offset = int(self.rng.integers(-self.jitter, self.jitter + 1))
+        target_x = fleet.left[target] + fleet.alien_width // 2 + self.offset
+
+        ship_x = ai_game.ship.rect.centerx
+        if target_x < ship_x - 2:
+            move = LEFT
+        elif target_x > ship_x + 2:
+            move = RIGHT
+        else:
+            move = STAY
+        return move + 3
+
+
+# Policies that can be chosen by name
+POLICIES = {
+    'random': RandomPolicy,
+    'tracking': TrackingPolicy,
+}
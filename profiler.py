@@ -0,0 +1,245 @@
+import csv
+import json
+from contextlib import nullcontext
+from time import perf_counter
+
+import numpy as np
+import pygame.font
+
+# nullcontext objects can be reused, so NullProfiler hands out just this one
+_NO_SECTION = nullcontext()
+
+class _Section:
+    """Times one phase of a frame; used as a context manager."""
+
+    def __init__(self, profiler, column):
+        self.profiler = profiler
+        self.column = column
+
+    def __enter__(self):
+        self.profiler._enter()
+
+    def __exit__(self, *exc_info):
+        self.profiler._exit(self.column)
+
+
+class FrameProfiler:
+    """
+    A class to time each phase of every frame and report where the time goes.
+
+    Timings are stored in a ring buffer holding the most recent frames. Each
+    phase's time excludes phases nested inside it, so collision checks aren't
+    counted again as part of updating the bullets.
+    """
+
+    # The phases of run_game(), in the order they run
+    phases = ('events', 'ship', 'bullets', 'collisions', 'aliens', 'screen')
+
+    def __init__(self, ai_game):
+        """Initialise the ring buffer and the overlay."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # One row per frame: the time of each phase, then the whole frame,
+        # the gap since the previous frame started, how long input could have
+        # waited before it was sampled, and the time from sampling the input
+        # to the frame being on the screen, all in seconds
+        self.capacity = self.settings.profile_frames
+        self.columns = self.phases + ('total', 'interval', 'input_wait', 'latency')
+        (self.total_column, self.interval_column,
+         self.wait_column, self.latency_column) = range(len(self.phases), len(self.columns))
+        self.times = np.zeros((self.capacity, len(self.columns)))
+
+        # Sprite counts for each frame
+        self.counts = np.zeros((self.capacity, 2), dtype=np.int64)
+
+        # Total frames profiled; the row for a frame is frame % capacity
+        self.frames = 0
+        self.row = self.times[0]
+
+        self.sections = {name: _Section(self, column)
+                         for column, name in enumerate(self.phases)}
+
+        # Start times of the sections currently running, and the time spent in
+        # sections nested inside each of them
+        self._starts = []
+        self._nested = []
+
+        self.frame_start = None
+
+        # When input was last sampled, and when the current frame sampled it
+        self.last_input_time = None
+        self.input_time = None
+
+        # Overlay settings; the text is re-rendered a few times a second, not
+        # every frame, so drawing the overlay doesn't distort the numbers
+        self.text_colour = (200, 0, 0)
+        self.font = ai_game.assets.get_font(24)
+        self.overlay_image = None
+        self.overlay_rect = None
+        self.overlay_refresh = max(self.settings.frame_rate, 60) // 4
+
+    def section(self, name):
+        """Return a context manager that times the named phase."""
+        return self.sections[name]
+
+    def _enter(self):
+        self._starts.append(perf_counter())
+        self._nested.append(0.0)
+
+    def _exit(self, column):
+        elapsed = perf_counter() - self._starts.pop()
+        self.row[column] += elapsed - self._nested.pop()
+        if self._nested:
+            self._nested[-1] += elapsed
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        now = perf_counter()
+        self.row = self.times[self.frames % self.capacity]
+        self.row[:] = 0.0
+        if self.frame_start is not None:
+            self.row[self.interval_column] = now - self.frame_start
+        self.frame_start = now
+        self.input_time = None
+
+    def input_sampled(self):
+        """Note that this frame has just read the player's input."""
+        now = perf_counter()
+        if self.last_input_time is not None:
+            # An event that arrived just after the last sample waited this long
+            self.row[self.wait_column] = now - self.last_input_time
+        self.last_input_time = self.input_time = now
+
+    def end_frame(self):
+        """Finish timing the current frame and record the sprite counts."""
+        now = perf_counter()
+        self.row[self.total_column] = now - self.frame_start
+        if self.input_time is not None:
+            # The frame has been drawn and flipped, so the input it used is showing
+            self.row[self.latency_column] = now - self.input_time
+        self.counts[self.frames % self.capacity] = (len(self.ai_game.aliens),
+                                                    len(self.ai_game.bullets))
+        self.frames += 1
+
+        if self.frames % self.overlay_refresh == 0:
+            self._prep_overlay()
+
+    def _recent(self):
+        """Return the rows of the ring buffer that hold recorded frames."""
+        return self.times[:min(self.frames, self.capacity)]
+
+    def summary(self):
+        """
+        Return FPS, frame-time percentiles (ms) and mean phase times (ms).
+
+        Input latency is the time from sampling input to the frame that used it
+        being flipped; the worst case adds the wait since the previous sample,
+        for input that arrived just after it.
+        """
+        times = self._recent()
+        if not len(times):
+            return {}
+
+        intervals = times[:, self.interval_column]
+        intervals = intervals[intervals > 0]
+        frame_ms = times[:, self.total_column] * 1000
+        latency_ms = times[:, self.latency_column] * 1000
+        worst_ms = latency_ms + times[:, self.wait_column] * 1000
+        return {
+            'fps': float(1 / intervals.mean()) if len(intervals) else 0.0,
+            'p50': float(np.percentile(frame_ms, 50)),
+            'p99': float(np.percentile(frame_ms, 99)),
+            'latency_p50': float(np.percentile(latency_ms, 50)),
+            'latency_p99': float(np.percentile(latency_ms, 99)),
+            'worst_latency_p99': float(np.percentile(worst_ms, 99)),
+            'phases': {name: float(times[:, column].mean() * 1000)
+                       for column, name in enumerate(self.phases)},
+        }
+
+    def _prep_overlay(self):
+        """Turn the latest summary into a rendered image."""
+        summary = self.summary()
+        lines = [
+            f"FPS {summary['fps']:.1f}  frame p50 {summary['p50']:.2f} ms"
+            f"  p99 {summary['p99']:.2f} ms",
+            f"input latency p50 {summary['latency_p50']:.2f} ms  p99 {summary['latency_p99']:.2f} ms"
+            f"  worst p99 {summary['worst_latency_p99']:.2f} ms",
+            f"aliens {len(self.ai_game.aliens)}  bullets {len(self.ai_game.bullets)}",
+            "  ".join(f"{name} {ms:.2f}" for name, ms in summary['phases'].items()),
+        ]
+        images = [self.font.render(line, True, self.text_colour, self.settings.bg_colour)
+                  for line in lines]
+
+        # Stack the lines into one image
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        self.overlay_image = pygame.Surface((width, height)).convert()
+        self.overlay_image.fill(self.settings.bg_colour)
+        y = 0
+        for image in images:
+            self.overlay_image.blit(image, (0, y))
+            y += image.get_height()
+
+        # Display the overlay at the bottom left of the screen
+        self.overlay_rect = self.overlay_image.get_rect()
+        self.overlay_rect.bottomleft = (10, self.screen.get_rect().bottom - 10)
+
+    def draw_overlay(self):
+        """Draw the overlay, if there's anything to show yet."""
+        if self.overlay_image and self.settings.profile_overlay:
+            self.screen.blit(self.overlay_image, self.overlay_rect)
+
+    def dump(self, path):
+        """Write the recorded frames to path, as JSON if it ends in .json, else CSV."""
+        frames = min(self.frames, self.capacity)
+        first = self.frames - frames
+        header = ('frame',) + self.columns + ('alien_count', 'bullet_count')
+
+        rows = []
+        for frame in range(first, self.frames):
+            row = frame % self.capacity
+            rows.append([frame]
+                        + [round(value * 1000, 4) for value in self.times[row].tolist()]
+                        + self.counts[row].tolist())
+
+        if path.endswith('.json'):
+            with open(path, 'w') as file:
+                json.dump({'units': 'ms', 'summary': self.summary(),
+                           'frames': [dict(zip(header, row)) for row in rows]},
+                          file, indent=1)
+        else:
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+
+class NullProfiler:
+    """A stand-in for FrameProfiler that does nothing, used when profiling is off."""
+
+    overlay_image = None
+    overlay_rect = None
+
+    def section(self, name):
+        return _NO_SECTION
+
+    def begin_frame(self):
+        pass
+
+    def input_sampled(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_overlay(self):
+        pass
+
+
+def create_profiler(ai_game):
+    """Return a FrameProfiler if the settings ask for one, else a NullProfiler."""
+    if ai_game.settings.profile:
+        return FrameProfiler(ai_game)
+    return NullProfiler()
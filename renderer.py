@@ -0,0 +1,237 @@
+import pygame
+
+from scaling import ScaledScreen
+
+class FullScreenRenderer:
+    """A class to redraw the whole screen every frame."""
+
+    def __init__(self, ai_game):
+        """Initialise the renderer for the game."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+    def invalidate(self):
+        """Nothing to do; every frame is drawn from scratch anyway."""
+
+    def render(self, alpha=1.0):
+        """
+        Draw every game element, and flip to the new screen.
+
+        alpha is how far between the last two logic steps moving things are
+        drawn; 1.0 draws them where they are now.
+        """
+        ai_game = self.ai_game
+
+        # Updates the background colour
+        self.screen.fill(self.settings.bg_colour)
+
+        # Draw bullets on the screen
+        ai_game.bullets.draw(self.screen, alpha)
+
+        # Draw the ship on the screen
+        ai_game.ship.blitme(alpha)
+
+        # Draw the aliens
+        ai_game.aliens.draw(self.screen, alpha)
+
+        # Draw the score information
+        ai_game.sb.show_score()
+
+        # Draw the play button if the is inactive
+        if not ai_game.game_active:
+            ai_game.play_button.draw_button()
+
+        # Draw the profiling overlay, if profiling is on
+        ai_game.profiler.draw_overlay()
+
+        # Update the screen with the latest drawings and changes
+        pygame.display.flip()
+
+
+class DirtyRectRenderer:
+    """
+    A class to redraw and push only the parts of the screen that changed.
+
+    The screen is split into layers (bullets, ship, aliens, scoreboard, Play
+    button and profiling overlay). Each frame a layer reports a signature that changes whenever
+    its picture does. Changed layers have their old rects painted over with
+    the background; then every layer touching a changed area is drawn again
+    and only those areas are sent to the display. When nothing has changed,
+    e.g. while the game waits for Play, a frame costs almost nothing.
+    """
+
+    # Layers with more rects than this send their bounding box to the display
+    # instead, as one big update is cheaper than thousands of small ones
+    max_update_rects = 32
+
+    def __init__(self, ai_game):
+        """Initialise the renderer for the game."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Each layer's signature and rects from the last frame drawn
+        self.previous = {}
+
+        # Background patches, by size, used to erase lots of rects in one blits()
+        self.patches = {}
+
+        # Start with a full redraw
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraw the whole screen next frame, e.g. after the window was exposed."""
+        self.full_redraw = True
+
+    def _layers(self, alpha):
+        """Return (name, signature, rects, draw) for each layer, in drawing order."""
+        ai_game = self.ai_game
+        sb = ai_game.sb
+
+        # Bullets leaving the top are clipped, as fill() won't clip them itself
+        bullets = ai_game.bullets
+        screen_rect = self.screen.get_rect()
+        bullet_rects = [
+            pygame.Rect(x, y, bullets.width, bullets.height).clip(screen_rect)
+            for x, y in zip(*(array.tolist() for array in bullets.positions(alpha)))
+        ]
+
+        ship_rect = ai_game.ship.interpolated_rect(alpha).copy()
+
+        fleet = ai_game.aliens
+        alien_rects = [
+            pygame.Rect(x, y, fleet.alien_width, fleet.alien_height)
+            for x, y in zip(*(array.tolist() for array in fleet.positions(alpha)))
+        ]
+
+        # The scoreboard bumps its revision whenever the HUD changes
+        score_rects = [rect.copy() for rect in sb.rects()]
+
+        button = ai_game.play_button
+        button_visible = not ai_game.game_active
+
+        profiler = ai_game.profiler
+        overlay_rects = ([profiler.overlay_rect.copy()]
+                         if profiler.overlay_image and self.settings.profile_overlay
+                         else [])
+
+        return [
+            ('bullets', tuple(map(tuple, bullet_rects)), bullet_rects,
+             lambda: bullets.draw(self.screen, alpha)),
+            ('ship', tuple(ship_rect), [ship_rect],
+             lambda: ai_game.ship.blitme(alpha)),
+            # Between logic steps the fleets move without their revision changing
+            ('aliens', (fleet.revision, fleet.anchors(alpha)),
+             alien_rects, lambda: fleet.draw(self.screen, alpha)),
+            ('score', sb.revision, score_rects, sb.show_score),
+            ('button', button_visible, [button.rect.copy()] if button_visible else [],
+             button.draw_button),
+            ('profiler', (profiler.overlay_image, tuple(map(tuple, overlay_rects))),
+             overlay_rects, profiler.draw_overlay),
+        ]
+
+    def _erase(self, rects):
+        """Paint the background over rects."""
+        bg_colour = self.settings.bg_colour
+        if len(rects) <= self.max_update_rects:
+            for rect in rects:
+                self.screen.fill(bg_colour, rect)
+            return
+
+        # A dense crowd of rects (a big, tightly packed fleet) mostly covers
+        # its bounding box, which is sent to the display whole anyway, so one
+        # fill is cheaper than painting over every rect
+        bounds = rects[0].unionall(rects[1:])
+        if bounds.width * bounds.height <= 2 * len(rects) * rects[0].width * rects[0].height:
+            self.screen.fill(bg_colour, bounds)
+            return
+
+        # Otherwise lots of rects (a moving fleet) are erased by blitting a
+        # background patch of the right size at each one
+        blits = []
+        for rect in rects:
+            patch = self.patches.get(rect.size)
+            if patch is None:
+                patch = pygame.Surface(rect.size).convert()
+                patch.fill(bg_colour)
+                self.patches[rect.size] = patch
+            blits.append((patch, rect))
+        self.screen.blits(blits, False)
+
+    def _update_rects(self, rects):
+        """Return the rects to send to the display for a layer's rects."""
+        if len(rects) <= self.max_update_rects:
+            return rects
+        return [rects[0].unionall(rects[1:])]
+
+    def render(self, alpha=1.0):
+        """
+        Draw the layers that changed, and update only those parts of the display.
+
+        alpha is how far between the last two logic steps moving things are
+        drawn; 1.0 draws them where they are now.
+        """
+        layers = self._layers(alpha)
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.screen.fill(self.settings.bg_colour)
+
+            # A layer with no rects has nothing on screen, e.g. the Play
+            # button during a game, so it isn't drawn here either
+            for name, signature, rects, draw in layers:
+                if rects:
+                    draw()
+                self.previous[name] = (signature, rects)
+            pygame.display.flip()
+            return
+
+        # Erase the old picture of every layer that changed
+        dirty = []
+        for name, signature, rects, draw in layers:
+            old_signature, old_rects = self.previous.get(name, (None, []))
+            if signature != old_signature:
+                self._erase(old_rects)
+                dirty.extend(self._update_rects(old_rects))
+                dirty.extend(self._update_rects(rects))
+
+        if not dirty:
+            return
+
+        # Draw every layer that touches a dirty area, keeping the original order
+        # so overlapping elements stack the same way as a full redraw. A layer
+        # is drawn whole, so it can cover part of a layer above it outside the
+        # dirty areas (the ship under the profiler overlay); the area it covers
+        # counts as redrawn, and any layer above that touches it is drawn
+        # again too. Every layer is opaque or colour-keyed, so drawing one
+        # over itself changes nothing.
+        redrawn = list(dirty)
+        for name, signature, rects, draw in layers:
+            update_rects = self._update_rects(rects)
+            if rects and any(rect.collidelist(redrawn) != -1 for rect in update_rects):
+                draw()
+                redrawn.extend(update_rects)
+            self.previous[name] = (signature, rects)
+
+        if isinstance(self.screen, ScaledScreen):
+            # The rects are on the game's screen, which is scaled in the window
+            dirty = [self.screen.window_rect(rect) for rect in dirty]
+        pygame.display.update(dirty)
+
+
+# Renderers that can be chosen with Settings.render_mode
+RENDERERS = {
+    'full': FullScreenRenderer,
+    'dirty': DirtyRectRenderer,
+}
+
+def create_renderer(ai_game):
+    """Return the renderer named by the game's settings."""
+    try:
+        renderer_class = RENDERERS[ai_game.settings.render_mode]
+    except KeyError:
+        raise ValueError(
+            f"Unknown render mode: {ai_game.settings.render_mode!r}"
+        ) from None
+    return renderer_class(ai_game)
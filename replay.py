@@ -0,0 +1,177 @@
+import argparse
+import struct
+import sys
+import time
+
+import pygame
+
+# Every recording starts with a magic number, a format version, the frame
+# rate it was recorded at and the size of the snapshot that follows: the
+# state of the game when recording began, which a replay starts from
+HEADER = struct.Struct('<4sBHI')
+MAGIC = b'AIRP'
+VERSION = 2
+
+# Each input event is one fixed-size record: the loop frame it arrived on,
+# what kind of event it was, the key, and the mouse position
+RECORD = struct.Struct('<IBihh')
+
+# Event kinds as stored in a recording. END marks the frame the recording
+# stopped on, so a replay runs for exactly as many frames. STEPS, stored in
+# the key field, is how many logic steps a frame took when that wasn't one,
+# as happens with a fixed timestep.
+KEYDOWN, KEYUP, MOUSEBUTTONDOWN, QUIT, END, STEPS = range(6)
+
+EVENT_KINDS = {
+    pygame.KEYDOWN: KEYDOWN,
+    pygame.KEYUP: KEYUP,
+    pygame.MOUSEBUTTONDOWN: MOUSEBUTTONDOWN,
+    pygame.QUIT: QUIT,
+}
+
+
+def encode_event(event):
+    """Return an event as (kind, key, x, y), or None if it doesn't affect the game."""
+    kind = EVENT_KINDS.get(event.type)
+    if kind is None:
+        return None
+    x, y = getattr(event, 'pos', (0, 0))
+    return kind, getattr(event, 'key', 0), x, y
+
+
+def decode_event(kind, key, x, y):
+    """Rebuild a pygame event from (kind, key, x, y)."""
+    if kind == KEYDOWN:
+        return pygame.event.Event(pygame.KEYDOWN, key=key)
+    elif kind == KEYUP:
+        return pygame.event.Event(pygame.KEYUP, key=key)
+    elif kind == MOUSEBUTTONDOWN:
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1)
+    return pygame.event.Event(pygame.QUIT)
+
+
+class InputRecorder:
+    """A class to write the input of each frame of a session to a file."""
+
+    def __init__(self, path, frame_rate, snapshot):
+        """Open the recording file and write its header and starting snapshot."""
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, frame_rate, len(snapshot)))
+        self.file.write(snapshot)
+
+        # Number of loop frames recorded so far
+        self.frame = 0
+
+    def record_frame(self, events):
+        """Record the input events handled on one pass of the game loop."""
+        for event in events:
+            record = encode_event(event)
+            if record is None:
+                # Nothing else affects the game, so nothing else is stored
+                continue
+            self.file.write(RECORD.pack(self.frame, *record))
+
+        self.frame += 1
+
+    def record_steps(self, steps):
+        """Record how many logic steps the last recorded frame took."""
+        if steps != 1:
+            self.file.write(RECORD.pack(self.frame - 1, STEPS, steps, 0, 0))
+
+    def close(self):
+        """Mark the end of the recording and close the file."""
+        if self.file.closed:
+            return
+        self.file.write(RECORD.pack(self.frame, END, 0, 0, 0))
+        self.file.close()
+
+
+class InputReplayer:
+    """A class to play a recorded session back through the game logic."""
+
+    def __init__(self, path):
+        """Read a recording into a list of events for each frame."""
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, self.frame_rate, snapshot_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an Alien Invasion recording")
+
+        # The state of the game when the recording began
+        records_start = HEADER.size + snapshot_size
+        self.snapshot = data[HEADER.size:records_start]
+
+        # Maps a frame number to the events handled on that frame, and to the
+        # number of logic steps it took if that wasn't one
+        self.frames = {}
+        self.steps = {}
+        self.frame_total = 0
+        for frame, kind, key, x, y in RECORD.iter_unpack(data[records_start:]):
+            if kind == END:
+                self.frame_total = frame
+                break
+            elif kind == STEPS:
+                self.steps[frame] = key
+                continue
+            self.frames.setdefault(frame, []).append(decode_event(kind, key, x, y))
+
+    def play(self, ai_game):
+        """
+        Drive ai_game through the recording as fast as possible.
+
+        The game is put back into the state the recording began in, then each
+        recorded frame handles its events and steps the logic exactly as
+        run_game() would, but nothing is drawn and nothing waits. ai_game must
+        run at the recording's frame rate, as pauses are counted in steps.
+        Returns the number of frames replayed.
+        """
+        if ai_game.settings.frame_rate != self.frame_rate:
+            raise ValueError(f"Recording was made at {self.frame_rate} frames per second, "
+                             f"not {ai_game.settings.frame_rate}")
+        ai_game.restore(self.snapshot)
+
+        for frame in range(self.frame_total):
+            try:
+                for event in self.frames.get(frame, ()):
+                    ai_game._handle_event(event)
+            except SystemExit:
+                # The player quit here
+                return frame
+
+            for _ in range(self.steps.get(frame, 1)):
+                if ai_game.game_active:
+                    ai_game.step()
+
+        return self.frame_total
+
+
+def main():
+    """Replay a recorded session headlessly and report how it ended."""
+    # Imported here so the game can import this module for recording
+    from alien_invasion import AlienInvasion
+    from settings import Settings
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Alien Invasion session.")
+    parser.add_argument('path', help="recording made with alien_invasion.py --record")
+    args = parser.parse_args()
+
+    replayer = InputReplayer(args.path)
+    settings = Settings()
+    settings.frame_rate = replayer.frame_rate
+    ai_game = AlienInvasion(headless=True, settings=settings)
+
+    # The session was played with pauses, so replay them to stay in step
+    ai_game.settings.skip_pauses = False
+
+    start = time.perf_counter()
+    frames = replayer.play(ai_game)
+    elapsed = time.perf_counter() - start
+
+    print(f"Frames: {frames} ({frames / max(elapsed, 1e-9):,.0f} per second)")
+    print(f"Score: {ai_game.stats.score:,}  Level: {ai_game.stats.level}  "
+          f"Ships left: {ai_game.stats.ship_left}  Active: {ai_game.game_active}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
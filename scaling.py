@@ -0,0 +1,131 @@
+import math
+import weakref
+
+import pygame
+
+class ScaledScreen:
+    """
+    A stand-in for the screen that scales everything drawn on it to fit a window.
+
+    The game keeps laying itself out and drawing at its own (logical) size;
+    positions are scaled as they're drawn and the result is centred in the
+    window, keeping its proportions. Each image is scaled the first time it's
+    drawn at a scale and the copy is cached, so frames never scale art. The
+    cache holds images weakly, so a rendered score that's been replaced
+    drops out of it.
+    """
+
+    def __init__(self, window, size):
+        """Initialise the screen to draw a game of the given size on window."""
+        self.size = size
+        self.rect = pygame.Rect((0, 0), size)
+
+        # Scaled copies of images, one cache for each scale used so far, so
+        # going back to an earlier window size doesn't scale everything again
+        self.caches = {}
+
+        self.fit(window)
+
+    def fit(self, window):
+        """Scale the game to fit window, e.g. after it was resized."""
+        self.window = window
+        window_width, window_height = window.get_size()
+        width, height = self.size
+        self.scale = min(window_width / width, window_height / height)
+
+        # Centre the game, leaving equal bars at the sides or top and bottom
+        self.offset_x = (window_width - round(width * self.scale)) // 2
+        self.offset_y = (window_height - round(height * self.scale)) // 2
+
+        self.images = self.caches.setdefault(self.scale, weakref.WeakKeyDictionary())
+
+    def get_rect(self, **kwargs):
+        """Return the rect of the game's logical screen."""
+        rect = self.rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def window_rect(self, rect):
+        """Return the part of the window that a rect on the logical screen covers."""
+        x, y, width, height = rect
+        scale = self.scale
+
+        # Edges are rounded rather than sizes, so rects that meet on the
+        # logical screen still meet in the window
+        left = math.floor(x * scale + 0.5) + self.offset_x
+        top = math.floor(y * scale + 0.5) + self.offset_y
+        right = math.floor((x + width) * scale + 0.5) + self.offset_x
+        bottom = math.floor((y + height) * scale + 0.5) + self.offset_y
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_logical(self, pos):
+        """Return the point on the logical screen under a point in the window."""
+        x, y = pos
+        return (int((x - self.offset_x) / self.scale),
+                int((y - self.offset_y) / self.scale))
+
+    def logical_event(self, event):
+        """Return event with any mouse position moved onto the logical screen."""
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return event
+        return pygame.event.Event(event.type, pos=self.to_logical(event.pos),
+                                  button=event.button)
+
+    def scaled_image(self, image):
+        """Return image scaled to the current scale, scaling it the first time only."""
+        scaled = self.images.get(image)
+        if scaled is None:
+            # Rounded up, so the image covers its window rect wherever it's drawn
+            width, height = image.get_size()
+            size = (math.ceil(width * self.scale), math.ceil(height * self.scale))
+
+            # Smoothing would blend colour-keyed edges into the key colour, and
+            # when shrinking it darkens flat colour slightly, which would leave
+            # a faint box round art drawn on the background colour
+            colour_key = image.get_colorkey()
+            if colour_key is None and image.get_bitsize() >= 24 and self.scale > 1:
+                scaled = pygame.transform.smoothscale(image, size)
+            else:
+                scaled = pygame.transform.scale(image, size)
+            if colour_key is not None:
+                scaled.set_colorkey(colour_key, pygame.RLEACCEL)
+            self.images[image] = scaled
+        return scaled
+
+    def fill(self, colour, rect=None):
+        """Fill a rect of the logical screen, or the whole window, with colour."""
+        if rect is None:
+            self.window.fill(colour)
+        else:
+            self.window.fill(colour, self.window_rect(rect))
+
+    def blit(self, image, dest):
+        """Draw image with its top left at dest on the logical screen."""
+        self.blits([(image, dest)], False)
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Draw each (image, dest) pair, like Surface.blits()."""
+        blits = []
+        image = scaled = None
+        for source, dest in blit_sequence:
+            # Runs of the same image (a fleet) only look it up once
+            if source is not image:
+                image = source
+                scaled = self.scaled_image(image)
+                width, height = image.get_size()
+
+            # Clip each copy to its window rect, so fills over the same
+            # logical rect always cover exactly what was drawn
+            target = self.window_rect((dest[0], dest[1], width, height))
+            blits.append((scaled, target.topleft, (0, 0, target.width, target.height)))
+        return self.window.blits(blits, doreturn)
@@ -1,9 +1,16 @@
+import pygame
 import pygame.font
-from pygame.sprite import Group
-from ship import Ship
+from text_cache import TextCache
+from scaling import ScaledScreen
 
 class Scoreboard:
-    """A class to report scoring information."""
+    """
+    A class to report scoring information.
+
+    The score, high score, level and ships left are composed onto one HUD
+    image, which is only rebuilt when one of them actually changes; every
+    other frame the HUD is drawn with a single blit.
+    """
 
     def __init__(self, ai_game):
         """Initialise scorekeeping attributes."""
@@ -15,9 +22,24 @@ class Scoreboard:
 
         # Font settings for scoring information
         self.text_colour = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.get_font(48)
+
+        # Scores are built from cached digit images instead of re-rendered
+        self.text_cache = TextCache(self.font, self.text_colour, self.settings.bg_colour)
+
+        # Ships left are drawn with the ship's shared image, not Ship sprites
+        self.ship_image = ai_game.assets.get_sprite('ship')
+        self.ship_rects = []
+
+        # Bumped whenever anything on the HUD changes; the composite image is
+        # rebuilt the next time it's drawn after that
+        self.revision = 0
+        self.hud_image = None
+        self.hud_rect = None
+        self.hud_revision = -1
 
         # Prepare the initial score images
+        self.score_image = self.high_score_image = self.level_image = None
         self.prep_score()
         self.prep_high_score()
         self.prep_level()
@@ -27,25 +49,32 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = f"{rounded_score:,}"
-        self.score_image = self.font.render(score_str, True,
-            self.text_colour, self.settings.bg_colour)
+        score_image = self.text_cache.render(score_str)
+        if score_image is self.score_image:
+            # Same text as before, so the HUD hasn't changed
+            return
+        self.score_image = score_image
 
         # Display the score at the top right of the screen
         self.score_rect = self.score_image.get_rect()
         self.score_rect.right = self.screen_rect.right - 20
         self.score_rect.top = 20
+        self.revision += 1
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"{high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, True,
-                                                 self.text_colour, self.settings.bg_colour)
+        high_score_image = self.text_cache.render(high_score_str)
+        if high_score_image is self.high_score_image:
+            return
+        self.high_score_image = high_score_image
 
         # Centre the high score at the top of the screen
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
         self.high_score_rect.top = self.score_rect.top
+        self.revision += 1
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
@@ -56,26 +85,65 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                                            self.text_colour, self.settings.bg_colour)
+        level_image = self.text_cache.render(level_str)
+        if level_image is self.level_image:
+            return
+        self.level_image = level_image
 
         # Position the level below the score
         self.level_rect = self.level_image.get_rect()
         self.level_rect.right = self.screen_rect.right - 20
         self.level_rect.top = self.score_rect.bottom + 10
+        self.revision += 1
 
     def prep_ships(self):
         """Show how many ships are left."""
-        self.ships = Group()
-        for ship_number in range(self.stats.ship_left):
-            ship = Ship(self.ai_game)
-            ship.rect.x = 10 + ship_number * ship.rect.width
-            ship.rect.y = 10
-            self.ships.add(ship)
+        if len(self.ship_rects) == self.stats.ship_left:
+            return
+
+        width, height = self.ship_image.get_size()
+        self.ship_rects = [pygame.Rect(10 + ship_number * width, 10, width, height)
+                           for ship_number in range(self.stats.ship_left)]
+        self.revision += 1
+
+    def rects(self):
+        """Return the rect of every item on the HUD."""
+        return [self.score_rect, self.high_score_rect, self.level_rect] + self.ship_rects
+
+    def _items(self):
+        """Return (image, rect) for every item on the HUD."""
+        return ([(self.score_image, self.score_rect),
+                 (self.high_score_image, self.high_score_rect),
+                 (self.level_image, self.level_rect)]
+                + [(self.ship_image, rect) for rect in self.ship_rects])
+
+    def _compose(self):
+        """Draw every HUD item onto one image covering them all."""
+        rects = self.rects()
+        self.hud_rect = rects[0].unionall(rects[1:])
+
+        # Background pixels are see-through, so the HUD can be drawn over the
+        # fleet; RLEACCEL lets blits skip the empty runs between items quickly
+        bg_colour = self.settings.bg_colour
+        self.hud_image = pygame.Surface(self.hud_rect.size).convert()
+        self.hud_image.fill(bg_colour)
+
+        offset = -self.hud_rect.x, -self.hud_rect.y
+        for image, rect in self._items():
+            self.hud_image.blit(image, rect.move(offset))
+        self.hud_image.set_colorkey(bg_colour, pygame.RLEACCEL)
+
+        self.hud_revision = self.revision
 
     def show_score(self):
         """Draw scores, level, and ships to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
\ No newline at end of file
+        if isinstance(self.screen, ScaledScreen):
+            # Scaled as one image, the items wouldn't line up with their own
+            # rects in the window, so each is drawn (and its scaled copy
+            # cached) separately; the screen batches them into one blits()
+            self.screen.blits(self._items(), False)
+            return
+
+        if self.hud_revision != self.revision:
+            self._compose()
+        self.screen.blit(self.hud_image, self.hud_rect)
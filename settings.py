@@ -1,3 +1,6 @@
+import argparse
+import json
+
 
 class Settings:
     """A class to store all settings for Alien Invasion."""
@@ -10,6 +13,43 @@ class Settings:
         self.screen_height = 600
         self.bg_colour = (230, 230, 230)
 
+        # The game is always laid out at screen_width by screen_height. A
+        # window_size (width, height) opens a resizable window of that size and
+        # fullscreen fills the display; either way the game is scaled to fit,
+        # with each image scaled once per scale rather than every frame
+        self.window_size = None
+        self.fullscreen = False
+
+        # 'dirty' only redraws and pushes the parts of the screen that changed;
+        # 'full' fills and flips the whole screen every frame
+        self.render_mode = 'dirty'
+
+        # The packed sprite sheet made by build_atlas.py
+        self.atlas_manifest = 'images/atlas.json'
+
+        # Frame rate; each logic step simulates one frame of this length
+        self.frame_rate = 60
+
+        # With fixed_timestep on, the logic always steps frame_rate times a
+        # second while frames are drawn at render_rate (0 for uncapped) and
+        # interpolated; a late frame makes up at most max_steps_per_frame steps
+        self.fixed_timestep = False
+        self.render_rate = 60
+        self.max_steps_per_frame = 5
+
+        # With split_process on, the logic runs in a process of its own at
+        # frame_rate and publishes what to draw through shared memory, and the
+        # window's process draws the latest frame at render_rate
+        self.split_process = False
+
+        # Profiling settings; when profile is on each phase of every frame is
+        # timed, the most recent profile_frames frames are kept, and they're
+        # written to profile_trace (CSV, or JSON if it ends in .json) on exit
+        self.profile = False
+        self.profile_overlay = True
+        self.profile_frames = 3600
+        self.profile_trace = None
+
         # Ship settings
         self.ship_limit = 3
 
@@ -19,9 +59,36 @@ class Settings:
         self.bullet_colour = (60, 60, 60)
         self.bullets_allowed = 3
 
+        # Collision settings
+        # 'grid' buckets aliens into a spatial grid; 'brute_force' tests every pair
+        self.collision_backend = 'grid'
+
         # Alien settings
         self.fleet_drop_speed = 10
 
+        # Distance from one alien to the next, in alien widths and heights;
+        # smaller values pack more aliens into the fleet
+        self.fleet_spacing = 2
+
+        # The rows of aliens are split into this many fleets, each moving on
+        # its own; the first sets off in fleet_direction and the rest
+        # alternate, and each fleet down moves fleet_speed_step faster
+        self.fleet_count = 1
+        self.fleet_speed_step = 0.0
+
+        # Seconds the game holds still after the ship is hit and after a fleet
+        # is destroyed; skip_pauses turns both off, e.g. for simulations
+        self.respawn_pause = 0.5
+        self.level_pause = 0.0
+        self.skip_pauses = False
+
+        # Print the time from start-up to the first frame drawn
+        self.report_startup = False
+
+        # Where the best scores are kept between sessions, and how many
+        self.high_score_file = 'high_scores.json'
+        self.high_score_entries = 10
+
         # How quickly the game speeds up
         self.speedup_scale = 1.1
 
@@ -30,13 +97,25 @@ class Settings:
 
         self.initialise_dynamic_settings()
 
+    @property
+    def timestep(self):
+        """Return the length of one logic step in seconds, from frame_rate."""
+        return 1 / self.frame_rate
+
+    def override(self, **values):
+        """Change any of the settings by name, e.g. for benchmarks and simulations."""
+        for name, value in values.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+
     def initialise_dynamic_settings(self):
         """Initialise settings that change throughout the game."""
         self.ship_speed = 5
         self.bullet_speed = 2.5
         self.alien_speed = 1.0
 
-        self.fleet_direction = 1  # Fleet direction 1 represents right; -1 represents left
+        self.fleet_direction = 1  # Direction the first fleet starts in: 1 is right; -1 is left
 
         # Scoring settings
         self.alien_points = 50
@@ -47,4 +126,20 @@ class Settings:
         self.bullet_speed += self.speedup_scale
         self.alien_speed *= self.speedup_scale
 
-        self.alien_points = int(self.alien_points * self.score_scale)
\ No newline at end of file
+        self.alien_points = int(self.alien_points * self.score_scale)
+
+def setting_override(text):
+    """
+    Parse a NAME=VALUE command-line override into (name, value).
+
+    The value is read as JSON, so numbers, booleans and lists come through
+    as such; anything else, like collision_backend=grid, is kept as a string.
+    For use as an argparse type.
+    """
+    name, equals, value = text.partition('=')
+    if not equals or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, not {text!r}")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
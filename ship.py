@@ -1,4 +1,3 @@
-import pygame
 from pygame.sprite import Sprite
 
 class Ship(Sprite):
@@ -18,8 +17,8 @@ class Ship(Sprite):
         # Access game settings
         self.settings = ai_game.settings
 
-        # Load the ship image and get its rect
-        self.image = pygame.image.load('images/ship.bmp')
+        # Use the shared ship image from the atlas and get its rect
+        self.image = ai_game.assets.get_sprite('ship')
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen
@@ -28,6 +27,9 @@ class Ship(Sprite):
         # Store a float for the ship's exact horizontal position
         self.x = float(self.rect.x)
 
+        # Where the ship was before the last logic step, for interpolation
+        self.prev_x = self.x
+
         # Movement flag; start with a ship that's not moving
         self.moving_right = False
         self.moving_left = False
@@ -48,7 +50,20 @@ class Ship(Sprite):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
+        self.prev_x = self.x
+
+    def remember_position(self):
+        """Store the current position before a logic step moves the ship."""
+        self.prev_x = self.x
+
+    def interpolated_rect(self, alpha=1.0):
+        """Return the ship's rect at a fraction alpha of the way through the last step."""
+        if alpha >= 1.0 or self.prev_x == self.x:
+            return self.rect
+        rect = self.rect.copy()
+        rect.x = self.prev_x + (self.x - self.prev_x) * alpha
+        return rect
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
\ No newline at end of file
+    def blitme(self, alpha=1.0):
+        """Draw the ship at its current location, or between its last two positions."""
+        self.screen.blit(self.image, self.interpolated_rect(alpha))
\ No newline at end of file
@@ -0,0 +1,204 @@
+import argparse
+import struct
+import sys
+
+import numpy as np
+import pygame
+
+# Every snapshot starts with a magic number, a format version and the screen
+# size it was taken at, since the fleet's positions only make sense on it
+HEADER = struct.Struct('<4sBHH')
+MAGIC = b'AISN'
+VERSION = 2
+
+# The game's scalar state: the game itself, the ship, the statistics, the
+# settings that change as the game goes on, and the sizes of the arrays after.
+# Counts that grow with play are 64-bit: alien points pass 2**31 at level 45
+STATE = struct.Struct('<?qdId??qIHqdddbqIII')
+
+# Settings the bot plays with unless told otherwise: with the usual three
+# bullets it rarely clears a level, but the game that loads the snapshot
+# uses its own settings anyway
+BOT_SETTINGS = {'bullets_allowed': 50}
+
+
+def take_snapshot(ai_game):
+    """
+    Return the state of the simulation as a compact bytes object.
+
+    Positions are stored as packed arrays rather than pickled sprites, so a
+    snapshot of a full fleet is a few kilobytes. What's drawn but doesn't
+    affect play (positions before the last step, the rendered HUD) is left
+    out and rebuilt when the snapshot is restored.
+    """
+    settings = ai_game.settings
+    stats = ai_game.stats
+    ship = ai_game.ship
+    fleet = ai_game.aliens
+    bullets = ai_game.bullets
+    count = bullets.count
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, settings.screen_width, settings.screen_height),
+        STATE.pack(ai_game.game_active, ai_game.frame_count, ai_game.sim_time,
+                   ai_game.pause_steps,
+                   ship.x, ship.moving_left, ship.moving_right,
+                   stats.score, stats.level, stats.ship_left, stats.high_score,
+                   settings.ship_speed, settings.bullet_speed, settings.alien_speed,
+                   settings.fleet_direction, settings.alien_points,
+                   len(fleet.x), fleet.fleet_count, count),
+        fleet.x.astype('<f8').tobytes(),
+        fleet.y.astype('<f8').tobytes(),
+        np.packbits(fleet.alive).tobytes(),
+        fleet.starts.astype('<i4').tobytes(),
+        fleet.directions.astype('<f8').tobytes(),
+        fleet.speed_scales.astype('<f8').tobytes(),
+        fleet.drop_distances.astype('<f8').tobytes(),
+        bullets.left[:count].astype('<i4').tobytes(),
+        bullets.y[:count].astype('<f8').tobytes(),
+    ]
+    return b''.join(parts)
+
+
+def restore_snapshot(ai_game, data):
+    """Put ai_game back into the state captured by take_snapshot()."""
+    magic, version, screen_width, screen_height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an Alien Invasion snapshot")
+    settings = ai_game.settings
+    if (screen_width, screen_height) != (settings.screen_width, settings.screen_height):
+        raise ValueError(f"Snapshot was taken on a {screen_width}x{screen_height} screen, "
+                         f"not {settings.screen_width}x{settings.screen_height}")
+
+    (game_active, frame_count, sim_time, pause_steps,
+     ship_x, moving_left, moving_right,
+     score, level, ship_left, high_score,
+     ship_speed, bullet_speed, alien_speed, fleet_direction, alien_points,
+     alien_total, fleet_count, bullet_count) = STATE.unpack_from(data, HEADER.size)
+
+    # Read the arrays back in the order they were written
+    offset = HEADER.size + STATE.size
+    def read(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    xs, ys = read('<f8', alien_total), read('<f8', alien_total)
+    alive = np.unpackbits(read(np.uint8, (alien_total + 7) // 8), count=alien_total)
+    starts = read('<i4', fleet_count)
+    directions = read('<f8', fleet_count)
+    speed_scales = read('<f8', fleet_count)
+    drop_distances = read('<f8', fleet_count)
+    bullet_left, bullet_y = read('<i4', bullet_count), read('<f8', bullet_count)
+
+    ai_game.game_active = game_active
+    ai_game.frame_count = frame_count
+    ai_game.sim_time = sim_time
+    ai_game.pause_steps = pause_steps
+
+    settings.ship_speed = ship_speed
+    settings.bullet_speed = bullet_speed
+    settings.alien_speed = alien_speed
+    settings.fleet_direction = fleet_direction
+    settings.alien_points = alien_points
+
+    stats = ai_game.stats
+    stats.score, stats.level, stats.ship_left = score, level, ship_left
+    stats.high_score = max(stats.high_score, high_score)
+
+    ship = ai_game.ship
+    ship.x = ship.prev_x = ship_x
+    ship.rect.x = ship_x
+    ship.moving_left, ship.moving_right = moving_left, moving_right
+
+    # Rebuild the fleet alive, then kill the dead so its per-fleet counts
+    # and bounding boxes are worked out the usual way
+    fleet = ai_game.aliens
+    fleet.set_positions(xs, ys, starts)
+    fleet.kill(alive == 0)
+    np.copyto(fleet.directions, directions)
+    np.copyto(fleet.speed_scales, speed_scales)
+    np.copyto(fleet.drop_distances, drop_distances)
+
+    ai_game.bullets.set_bullets(bullet_left, bullet_y)
+
+    # Bring everything drawn from the state up to date
+    sb = ai_game.sb
+    sb.prep_score()
+    sb.prep_high_score()
+    sb.prep_level()
+    sb.prep_ships()
+    ai_game.renderer.invalidate()
+    pygame.mouse.set_visible(not game_active)
+
+
+def save_snapshot(ai_game, path):
+    """Write a snapshot of ai_game to the file at path."""
+    with open(path, 'wb') as file:
+        file.write(take_snapshot(ai_game))
+
+
+def load_snapshot(ai_game, path):
+    """Restore ai_game from a snapshot file written by save_snapshot()."""
+    with open(path, 'rb') as file:
+        restore_snapshot(ai_game, file.read())
+
+
+def main():
+    """Play a headless game with a bot until it reaches a level, and save a snapshot."""
+    # Imported here so the game can import this module
+    from alien_invasion import AlienInvasion
+    from policies import POLICIES, apply_action
+    from settings import Settings, setting_override
+
+    parser = argparse.ArgumentParser(
+        description="Save a snapshot of a game that has reached a given level, "
+                    "e.g. to profile late levels without playing up to them.")
+    parser.add_argument('path', help="file to save the snapshot to")
+    parser.add_argument('--level', type=int, default=5, help="level to reach (default: 5)")
+    parser.add_argument('--policy', choices=list(POLICIES), default='tracking',
+                        help="how the ship is controlled (default: tracking)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the policy")
+    parser.add_argument('--max-frames', type=int, default=200_000,
+                        help="give up after this many frames (default: 200,000)")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        type=setting_override,
+                        help="override a setting while playing, e.g. --set fleet_spacing=1.25 "
+                             f"(default: {', '.join(f'{name}={value}' for name, value in BOT_SETTINGS.items())}); "
+                             "the game that loads the snapshot uses its own settings")
+    args = parser.parse_args()
+
+    overrides = dict(BOT_SETTINGS)
+    overrides.update(args.set)
+
+    settings = Settings()
+    try:
+        settings.override(**overrides)
+    except ValueError as error:
+        parser.error(str(error))
+    ai_game = AlienInvasion(headless=True, settings=settings)
+    policy = POLICIES[args.policy](np.random.default_rng(args.seed))
+
+    # Keep starting new games until one gets far enough
+    frames = 0
+    ai_game.start_game()
+    while ai_game.stats.level < args.level and frames < args.max_frames:
+        apply_action(ai_game, policy.act(ai_game))
+        ai_game.step()
+        frames += 1
+        if not ai_game.game_active:
+            ai_game.start_game()
+
+    if ai_game.stats.level < args.level:
+        print(f"Gave up after {frames:,} frames at level {ai_game.stats.level}")
+        return 1
+
+    save_snapshot(ai_game, args.path)
+    print(f"Saved level {ai_game.stats.level} (score {ai_game.stats.score:,}) "
+          f"after {frames:,} frames to {args.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+import pygame
+
+class TextCache:
+    """
+    A class to render text in one font and colour scheme without repeating work.
+
+    Numbers are built from glyph images that are each rendered only once, so a
+    new score costs a few blits rather than a TrueType rasterisation. Any other
+    text is rendered whole. Either way, the most recently used strings are
+    kept, so asking for the same text again returns the same surface.
+    """
+
+    # Characters that numbers are built from
+    glyph_chars = frozenset('0123456789,.- ')
+
+    def __init__(self, font, text_colour, bg_colour, max_strings=64):
+        """Initialise an empty cache for a font and its colours."""
+        self.font = font
+        self.text_colour = text_colour
+        self.bg_colour = bg_colour
+
+        # Maps a single character to its rendered image and that image's width
+        self.glyphs = {}
+
+        # Maps whole strings to their images, least recently used first
+        self.strings = OrderedDict()
+        self.max_strings = max_strings
+
+    def render(self, text):
+        """Return an image of text; treat it as read-only, as it's shared."""
+        image = self.strings.get(text)
+        if image is not None:
+            self.strings.move_to_end(text)
+            return image
+
+        if text and self.glyph_chars.issuperset(text):
+            image = self._compose(text)
+        else:
+            image = self._render(text)
+
+        self.strings[text] = image
+        if len(self.strings) > self.max_strings:
+            # Forget the string that was used longest ago
+            self.strings.popitem(last=False)
+        return image
+
+    def _render(self, text):
+        """Rasterise text with the font, in the display's pixel format."""
+        image = self.font.render(text, True, self.text_colour, self.bg_colour)
+        # Font renders 8-bit images, which are about twice as slow to blit
+        # every frame, so convert them if there's a display to convert to
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+        return image
+
+    def preload_glyphs(self):
+        """Render every glyph now, so the first scores drawn don't have to."""
+        for char in self.glyph_chars:
+            self._glyph(char)
+
+    def _glyph(self, char):
+        """Return the image and width of a single character, rendering it the first time."""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            image = self._render(char)
+            glyph = (image, image.get_width())
+            self.glyphs[char] = glyph
+        return glyph
+
+    def _compose(self, text):
+        """Build an image of text by placing cached glyphs side by side."""
+        blits = []
+        x = 0
+        for char in text:
+            image, width = self.glyphs.get(char) or self._glyph(char)
+            blits.append((image, (x, 0)))
+            x += width
+
+        # Every glyph is as tall as the font's line, so they cover the image
+        first_image = blits[0][0]
+        image = pygame.Surface((x, first_image.get_height()), 0, first_image)
+        image.blits(blits, False)
+        return image